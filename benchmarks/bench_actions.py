@@ -0,0 +1,75 @@
+"""Refresh time of an action column: per-row button widgets versus ActionDelegate.
+
+Usage: python benchmarks/bench_actions.py [--rows 10000]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtWidgets import QApplication, QTableWidget, QTableWidgetItem, QWidget, QHBoxLayout, QPushButton
+
+from table_model import LazyTableModel, create_table_view, set_action_column
+
+
+def machine_rows(count):
+    return [(i, f"Machine {i}", "Type A", "Plant", "2025-01-01", 30, None, "Healthy") for i in range(1, count + 1)]
+
+
+def refresh_widgets(table, machines):
+    table.setRowCount(0)
+    for machine in machines:
+        row_position = table.rowCount()
+        table.insertRow(row_position)
+        for column, field in enumerate((1, 2, 7, 3)):
+            table.setItem(row_position, column, QTableWidgetItem(machine[field]))
+        actions_widget = QWidget()
+        actions_layout = QHBoxLayout(actions_widget)
+        edit_button = QPushButton("Edit")
+        edit_button.clicked.connect(lambda _, m=machine: None)
+        actions_layout.addWidget(edit_button)
+        maintenance_button = QPushButton("Log Maintenance")
+        maintenance_button.clicked.connect(lambda _, m=machine: None)
+        actions_layout.addWidget(maintenance_button)
+        table.setCellWidget(row_position, 4, actions_widget)
+
+
+def timed(app, func):
+    started = time.perf_counter()
+    func()
+    app.processEvents()
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=10000)
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    machines = machine_rows(args.rows)
+    headers = ["Name", "Type", "Status", "Location", "Actions"]
+
+    table = QTableWidget()
+    table.setColumnCount(len(headers))
+    table.setHorizontalHeaderLabels(headers)
+    table.show()
+    elapsed = timed(app, lambda: refresh_widgets(table, machines))
+    print(f"QTableWidget + cell widgets: {elapsed * 1000:10.1f} ms for {args.rows} rows")
+    table.close()
+
+    model = LazyTableModel(headers, [1, 2, 7, 3],
+                           lambda after_id, limit: [m for m in machines if m[0] > after_id][:limit],
+                           page_size=args.rows)
+    view = create_table_view(model)
+    set_action_column(view, 4, [("Edit", lambda m: None), ("Log Maintenance", lambda m: None)])
+    view.show()
+    elapsed = timed(app, model.refresh)
+    print(f"LazyTableModel + ActionDelegate: {elapsed * 1000:7.1f} ms for {model.rowCount()} rows")
+    view.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+"""Query latency on a synthetic database, without and with the migration indexes.
+
+Usage: python benchmarks/bench_indexes.py [--rows 1000000]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import Database
+
+STATUSES = ['Healthy', 'Warning', 'Critical']
+
+
+def populate(db, rows):
+    machines = max(rows // 100, 1)
+    start = date(2015, 1, 1)
+    rng = random.Random(42)
+
+    db.cursor.executemany('''
+    INSERT INTO machines (name, type, location, installation_date, maintenance_frequency, status)
+    VALUES (?, ?, ?, ?, ?, ?)
+    ''', ((f"Machine {i}", "Type A", "Plant", start.isoformat(), 30, rng.choice(STATUSES))
+          for i in range(machines)))
+
+    def random_date():
+        return (start + timedelta(days=rng.randrange(3650))).isoformat()
+
+    per_table = rows // 3
+    db.cursor.executemany('''
+    INSERT INTO inspections (machine_id, inspection_date, inspector, result, notes)
+    VALUES (?, ?, ?, ?, ?)
+    ''', ((rng.randrange(1, machines + 1), random_date(), "bench", "Pass", "") for _ in range(per_table)))
+    db.cursor.executemany('''
+    INSERT INTO maintenance_history (machine_id, maintenance_date, description)
+    VALUES (?, ?, ?)
+    ''', ((rng.randrange(1, machines + 1), random_date(), "bench") for _ in range(per_table)))
+    db.cursor.executemany('''
+    INSERT INTO calendar_events (title, start_date, end_date, description, event_type)
+    VALUES (?, ?, ?, ?, ?)
+    ''', (("bench", d, d, "", "Maintenance") for d in (random_date() for _ in range(per_table))))
+    db.conn.commit()
+    return machines
+
+
+def measure(label, func, repeat=20):
+    func()
+    started = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    elapsed = (time.perf_counter() - started) / repeat
+    print(f"  {label:<40} {elapsed * 1000:10.3f} ms")
+
+
+def run_queries(db, machines):
+    rng = random.Random(7)
+    measure("get_inspections(machine_id)", lambda: db.get_inspections(rng.randrange(1, machines + 1)))
+    measure("get_maintenance_history(machine_id)", lambda: db.get_maintenance_history(rng.randrange(1, machines + 1)))
+    measure("get_calendar_events(start, end)", lambda: db.get_calendar_events('2020-06-01', '2020-06-02'))
+    measure("machines WHERE status = 'Critical'",
+            lambda: db.cursor.execute("SELECT id FROM machines WHERE status = 'Critical'").fetchall())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=1000000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, 'bench.db'))
+        started = time.perf_counter()
+        machines = populate(db, args.rows)
+        print(f"Populated {args.rows} rows in {time.perf_counter() - started:.1f} s")
+
+        indexes = db.cursor.execute(
+            "SELECT name, sql FROM sqlite_master WHERE type = 'index' AND name LIKE 'idx_%'").fetchall()
+        for name, _ in indexes:
+            db.cursor.execute(f"DROP INDEX {name}")
+        db.cursor.execute("ANALYZE")
+        print("Without indexes:")
+        run_queries(db, machines)
+
+        for _, sql in indexes:
+            db.cursor.execute(sql)
+        db.cursor.execute("ANALYZE")
+        print("With indexes:")
+        run_queries(db, machines)
+        db.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+"""Per-machine PredictiveMaintenance calls versus the vectorized batch methods.
+
+Usage: python benchmarks/bench_predictions.py [--machines 1000000]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from predictive_maintenance import PredictiveMaintenance
+
+
+def synthetic_machines(count):
+    rng = random.Random(42)
+    start = date(2020, 1, 1)
+    machines = []
+    for i in range(count):
+        installed = start + timedelta(days=rng.randrange(1500))
+        last = (installed + timedelta(days=rng.randrange(300))).isoformat() if rng.random() < 0.8 else None
+        machines.append((i + 1, f"Machine {i}", "Type A", "Plant", installed.isoformat(), rng.randrange(7, 365), last,
+                         "Healthy"))
+    return machines
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--machines', type=int, default=1000000)
+    args = parser.parse_args()
+    machines = synthetic_machines(args.machines)
+
+    started = time.perf_counter()
+    for machine in machines:
+        PredictiveMaintenance.predict_next_maintenance(machine)
+        PredictiveMaintenance.estimate_remaining_life(machine)
+    scalar = time.perf_counter() - started
+    print(f"Per-machine calls:          {scalar:8.3f} s")
+
+    started = time.perf_counter()
+    _, last_maintenance, frequencies = PredictiveMaintenance.machine_arrays(machines)
+    converted = time.perf_counter()
+    PredictiveMaintenance.predict_next_maintenance_batch(last_maintenance, frequencies, rng=1)
+    PredictiveMaintenance.estimate_remaining_life_batch(last_maintenance, frequencies, rng=2)
+    finished = time.perf_counter()
+    print(f"Batch (from result set):    {finished - started:8.3f} s  ({scalar / (finished - started):.0f}x)")
+    print(f"Batch (from arrays):        {finished - converted:8.3f} s  ({scalar / (finished - converted):.0f}x)")
+
+
+if __name__ == '__main__':
+    main()
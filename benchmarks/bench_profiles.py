@@ -0,0 +1,80 @@
+"""Insert and read throughput of each connection profile.
+
+Usage: python benchmarks/bench_profiles.py [--rows 1000000] [--db dashboard.db]
+
+With --db the given database is copied once and every profile runs against the copy;
+otherwise a synthetic database with --rows maintenance_history rows is generated.
+"""
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import Database, CONNECTION_PROFILES
+
+
+def populate(db_name, rows):
+    db = Database(db_name, profile='fast')
+    machines = max(rows // 100, 1)
+    db.cursor.executemany('''
+    INSERT INTO machines (name, type, location, installation_date, maintenance_frequency, status)
+    VALUES (?, ?, ?, ?, ?, ?)
+    ''', ((f"Machine {i}", "Type A", "Plant", "2020-01-01", 30, "Healthy") for i in range(machines)))
+    db.cursor.executemany('''
+    INSERT INTO maintenance_history (machine_id, maintenance_date, description)
+    VALUES (?, ?, ?)
+    ''', ((i % machines + 1, "2024-01-01", "Synthetic maintenance entry " * 4) for i in range(rows)))
+    db.conn.commit()
+    db.close()
+
+
+def run_profile(db_name, profile, writes, reads):
+    db = Database(db_name, profile=profile)
+    machines = db.cursor.execute("SELECT COALESCE(MAX(id), 1) FROM machines").fetchone()[0]
+    rng = random.Random(1)
+
+    started = time.perf_counter()
+    for _ in range(writes):
+        db.add_maintenance(rng.randrange(1, machines + 1), "bench")
+    write_rate = writes / (time.perf_counter() - started)
+
+    started = time.perf_counter()
+    for _ in range(reads):
+        db.get_maintenance_history(rng.randrange(1, machines + 1))
+    read_rate = reads / (time.perf_counter() - started)
+
+    started = time.perf_counter()
+    db.cursor.execute("SELECT COUNT(*), MAX(LENGTH(description)) FROM maintenance_history").fetchone()
+    scan = time.perf_counter() - started
+    db.close()
+    return write_rate, read_rate, scan
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=1000000)
+    parser.add_argument('--db', help="existing database to copy and benchmark")
+    parser.add_argument('--writes', type=int, default=500)
+    parser.add_argument('--reads', type=int, default=5000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_name = os.path.join(tmp, 'bench.db')
+        if args.db:
+            shutil.copy(args.db, db_name)
+        else:
+            populate(db_name, args.rows)
+        print(f"Database size: {os.path.getsize(db_name) / 1024 / 1024:.0f} MiB")
+        print(f"{'profile':<10} {'inserts/s':>12} {'reads/s':>12} {'full scan':>12}")
+        for profile in CONNECTION_PROFILES:
+            write_rate, read_rate, scan = run_profile(db_name, profile, args.writes, args.reads)
+            print(f"{profile:<10} {write_rate:12.0f} {read_rate:12.0f} {scan * 1000:10.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+"""Cold start to the login screen for databases of increasing size.
+
+Usage: python benchmarks/bench_startup.py [--rows 0 100000 1000000]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtWidgets import QApplication
+
+from database import Database
+from main_window import MainWindow
+
+
+def populate(db_name, rows):
+    db = Database(db_name)
+    db.cursor.executemany('''
+    INSERT INTO machines (name, type, location, installation_date, maintenance_frequency, status)
+    VALUES (?, ?, ?, ?, ?, ?)
+    ''', ((f"Machine {i}", "Type A", "Plant", "2025-01-01", 30, "Healthy") for i in range(rows // 10)))
+    db.cursor.executemany('''
+    INSERT INTO work_orders (title, description, status, priority, assigned_to, due_date)
+    VALUES (?, ?, ?, ?, ?, ?)
+    ''', ((f"Work order {i}", "bench", "Open", "Low", None, "2025-01-01") for i in range(rows // 2)))
+    db.cursor.executemany('''
+    INSERT INTO inspections (machine_id, inspection_date, inspector, result, notes)
+    VALUES (?, ?, ?, ?, ?)
+    ''', ((i % max(rows // 10, 1) + 1, "2025-01-01", "bench", "Pass", "") for i in range(rows - rows // 10 - rows // 2)))
+    db.conn.commit()
+    db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, nargs='+', default=[0, 100000, 1000000])
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    for rows in args.rows:
+        with tempfile.TemporaryDirectory() as tmp:
+            db_name = os.path.join(tmp, 'bench.db')
+            populate(db_name, rows)
+
+            started = time.perf_counter()
+            window = MainWindow(db_name, sweep_interval=None)
+            window.show()
+            app.processEvents()
+            elapsed = time.perf_counter() - started
+            print(f"{rows:>9} rows: login screen in {elapsed * 1000:8.1f} ms")
+            window.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+"""Time to first screen for the lazily paginated list pages, and the longest event loop
+stall while another connection holds the write lock (the target is 16 ms, one frame).
+
+Usage: python benchmarks/bench_tables.py [--rows 500000]
+"""
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtCore import QTimer
+from PyQt5.QtWidgets import QApplication
+
+from database import Database
+from db_worker import AsyncDatabase
+from work_orders_page import WorkOrdersPage
+
+
+class BenchWindow:
+    def __init__(self, db, async_db):
+        self.db = db
+        self.async_db = async_db
+
+
+def hold_write_lock(db_name, seconds, locked):
+    # Stands in for the status sweep or telemetry ingest committing a long batch
+    conn = sqlite3.connect(db_name, isolation_level=None)
+    conn.execute("BEGIN IMMEDIATE")
+    locked.set()
+    time.sleep(seconds)
+    conn.execute("COMMIT")
+    conn.close()
+
+
+def longest_stall(app, seconds):
+    # Runs the event loop for seconds and returns the longest gap between 1 ms timer ticks
+    ticks = [time.perf_counter()]
+    timer = QTimer()
+    timer.timeout.connect(lambda: ticks.append(time.perf_counter()))
+    timer.start(1)
+    while time.perf_counter() - ticks[0] < seconds:
+        app.processEvents()
+        time.sleep(0.0005)
+    timer.stop()
+    return max(later - earlier for earlier, later in zip(ticks, ticks[1:]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=500000)
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    with tempfile.TemporaryDirectory() as tmp:
+        db_name = os.path.join(tmp, 'bench.db')
+        db = Database(db_name)
+        db.cursor.executemany('''
+        INSERT INTO work_orders (title, description, status, priority, assigned_to, due_date)
+        VALUES (?, ?, ?, ?, ?, ?)
+        ''', ((f"Work order {i}", "bench", "Open", "Low", None, "2025-01-01") for i in range(args.rows)))
+        db.conn.commit()
+        async_db = AsyncDatabase(db_name)
+
+        tracemalloc.start()
+        started = time.perf_counter()
+        page = WorkOrdersPage(BenchWindow(db, async_db))
+        page.resize(1200, 800)
+        page.show()
+        while page.model.rowCount() == 0:
+            app.processEvents()
+        app.processEvents()
+        elapsed = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        print(f"{args.rows} work orders: first screen in {elapsed * 1000:.1f} ms, "
+              f"{page.model.rowCount()} rows loaded, peak Python memory {peak / 1024:.0f} KiB")
+
+        started = time.perf_counter()
+        loaded = page.model.rowCount()
+        page.table.scrollToBottom()
+        while page.model.rowCount() == loaded:
+            app.processEvents()
+        print(f"Scroll to end of loaded rows: {(time.perf_counter() - started) * 1000:.1f} ms, "
+              f"{page.model.rowCount()} rows loaded")
+
+        # Save an edit through AsyncDatabase while a writer holds the lock; compared with an
+        # idle event loop, since timer jitter alone shows up as a few ms
+        idle = longest_stall(app, 1.0)
+        locked = threading.Event()
+        writer = threading.Thread(target=hold_write_lock, args=(db_name, 2.0, locked))
+        writer.start()
+        locked.wait()
+        saved = []
+        async_db.update_work_order(1, "Edited", "bench", "Open", "Low", None, "2025-01-01",
+                                   callback=lambda _: saved.append(time.perf_counter()))
+        stall = longest_stall(app, 3.0)
+        writer.join()
+        print(f"Longest event loop stall with an edit waiting 2 s on the write lock: {stall * 1000:.1f} ms "
+              f"(idle {idle * 1000:.1f} ms, target 16 ms), edit saved: {bool(saved)}")
+        page.close()
+        async_db.close()
+        db.close()
+
+
+if __name__ == '__main__':
+    main()
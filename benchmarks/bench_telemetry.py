@@ -0,0 +1,87 @@
+"""Sustained TelemetryIngest throughput, with read latency measured alongside it,
+then the cost of charting different time ranges from the rollup tiers.
+
+Usage: python benchmarks/bench_telemetry.py [--readings 2000000] [--machines 1000] [--profile balanced]
+
+Readings are produced as fast as add_many accepts them, in the interleaved order a live
+fleet would send them, into a fresh temporary database. A second connection keeps
+querying the latest readings meanwhile, as the dashboard would.
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import Database
+from telemetry import TelemetryIngest
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--readings', type=int, default=2000000)
+    parser.add_argument('--machines', type=int, default=1000)
+    parser.add_argument('--batch-size', type=int, default=20000)
+    parser.add_argument('--profile', default='balanced')
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    db_name = os.path.join(directory, 'telemetry.db')
+    Database(db_name, profile=args.profile).close()
+    try:
+        stop = threading.Event()
+        latencies = []
+
+        def read_latest():
+            db = Database(db_name, profile=args.profile)
+            while not stop.is_set():
+                started = time.perf_counter()
+                db.get_latest_telemetry(1, 500)
+                latencies.append(time.perf_counter() - started)
+                time.sleep(0.05)
+            db.close()
+
+        reader = threading.Thread(target=read_latest)
+        reader.start()
+        ingest = TelemetryIngest(db_name, batch_size=args.batch_size, db_options={'profile': args.profile})
+        start_ts = int(time.time() * 1000) - args.readings // args.machines * 1000
+        started = time.perf_counter()
+        batch = []
+        for i in range(args.readings):
+            batch.append((i % args.machines + 1, start_ts + (i // args.machines) * 1000, float(i % 100)))
+            if len(batch) == 1000:
+                ingest.add_many(batch)
+                batch = []
+        ingest.add_many(batch)
+        produced = time.perf_counter() - started
+        ingest.close()
+        elapsed = time.perf_counter() - started
+        stop.set()
+        reader.join()
+
+        latencies.sort()
+        print(f"Produced {args.readings} readings in {produced:.2f} s; all flushed after {elapsed:.2f} s")
+        print(f"Sustained ingest: {args.readings / elapsed:,.0f} readings/s "
+              f"({ingest.flushes} flushes, {ingest.flush_seconds:.2f} s inside flushes)")
+        if latencies:
+            print(f"Concurrent reads: median {latencies[len(latencies) // 2] * 1000:.1f} ms, "
+                  f"max {latencies[-1] * 1000:.1f} ms over {len(latencies)} queries")
+
+        db = Database(db_name, profile=args.profile)
+        end_ts = start_ts + args.readings // args.machines * 1000
+        for label, span in [("1 hour", 3600000), ("1 day", 86400000), ("1 week", 7 * 86400000),
+                            ("full range", end_ts - start_ts)]:
+            started = time.perf_counter()
+            series = db.get_telemetry_series(1, end_ts - span, end_ts, 800)
+            print(f"Series over {label:>10}: {len(series):4d} points in {(time.perf_counter() - started) * 1000:.1f} ms")
+        db.close()
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main()
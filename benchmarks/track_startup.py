@@ -0,0 +1,96 @@
+"""Track startup time across commits.
+
+Runs `main.py --profile-startup` several times, takes the median of each phase,
+appends the result for the current git commit to a JSONL history file and
+compares it with the most recent entry from a different commit. Each run starts
+from a fresh temporary copy of the database, so the tracked dashboard.db is never
+migrated or written to.
+
+Usage: python benchmarks/track_startup.py [--runs 5] [--history startup_history.jsonl]
+                                          [--db dashboard.db] [--threshold 10]
+Exits with status 1 when total startup time regressed by more than --threshold percent.
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def profile_once(db):
+    with tempfile.TemporaryDirectory() as tmp:
+        report_path = os.path.join(tmp, 'startup.json')
+        db_copy = os.path.join(tmp, 'startup.db')
+        source = db or os.path.join(ROOT, 'dashboard.db')
+        if os.path.exists(source):
+            shutil.copyfile(source, db_copy)
+        command = [sys.executable, os.path.join(ROOT, 'main.py'), '--profile-startup', report_path, '--db', db_copy]
+        subprocess.run(command, cwd=ROOT, check=True)
+        with open(report_path) as f:
+            return json.load(f)
+
+
+def summarize(reports):
+    phases = {}
+    for report in reports:
+        for phase in report['phases']:
+            phases.setdefault(phase['phase'], []).append(phase['duration_ms'])
+    return {
+        'total_ms': statistics.median(report['total_ms'] for report in reports),
+        'phases': {name: statistics.median(durations) for name, durations in phases.items()},
+    }
+
+
+def load_history(path):
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Track startup time across commits")
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--history', default='startup_history.jsonl')
+    parser.add_argument('--db', help="database to profile against (a copy is used), defaults to dashboard.db")
+    parser.add_argument('--threshold', type=float, default=10.0, help="allowed regression of total time, in percent")
+    args = parser.parse_args()
+
+    commit = git_commit()
+    entry = summarize([profile_once(args.db) for _ in range(args.runs)])
+    entry['commit'] = commit
+
+    history = load_history(args.history)
+    previous = next((item for item in reversed(history) if item['commit'] != commit), None)
+    with open(args.history, 'a') as f:
+        f.write(json.dumps(entry) + '\n')
+
+    print(f"{'phase':<24} {'ms':>10} {'previous':>10} {'change':>8}")
+    rows = [('total', entry['total_ms'], previous['total_ms'] if previous else None)]
+    rows += [(name, value, previous['phases'].get(name) if previous else None)
+             for name, value in entry['phases'].items()]
+    for name, value, before in rows:
+        change = f"{(value - before) / before * 100:+7.1f}%" if before else ''
+        before = f"{before:10.1f}" if before is not None else ''
+        print(f"{name:<24} {value:10.1f} {before:>10} {change:>8}")
+
+    if previous and entry['total_ms'] > previous['total_ms'] * (1 + args.threshold / 100):
+        print(f"Startup regressed against {previous['commit']}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,14 +1,63 @@
 from PyQt5.QtWidgets import QWidget, QVBoxLayout, QCalendarWidget, QListWidget, QPushButton, QDialog, QFormLayout, QLineEdit, QDateTimeEdit, QTextEdit
 from PyQt5.QtCore import QDate, QDateTime
+from PyQt5.QtGui import QTextCharFormat, QFont, QColor
+
+class IntervalTree:
+    # Static centered interval tree over closed [start, end] intervals, answering
+    # "which intervals contain this point" in O(log n + matches)
+    def __init__(self, intervals):
+        # (start, end, value) tuples; an inverted interval is stored as [end, start] so a
+        # bad row cannot break the partition below
+        intervals = [(min(start, end), max(start, end), value) for start, end, value in intervals]
+        self.center = None
+        self.left = self.right = None
+        if not intervals:
+            return
+        endpoints = sorted(bound for start, end, _ in intervals for bound in (start, end))
+        self.center = endpoints[len(endpoints) // 2]
+        here = [interval for interval in intervals if interval[0] <= self.center <= interval[1]]
+        self.by_start = sorted(here, key=lambda interval: interval[0])
+        self.by_end = sorted(here, key=lambda interval: interval[1], reverse=True)
+        left = [interval for interval in intervals if interval[1] < self.center]
+        right = [interval for interval in intervals if interval[0] > self.center]
+        self.left = IntervalTree(left) if left else None
+        self.right = IntervalTree(right) if right else None
+
+    def query(self, point):
+        found = []
+        node = self
+        while node is not None and node.center is not None:
+            if point < node.center:
+                for start, end, value in node.by_start:
+                    if start > point:
+                        break
+                    found.append(value)
+                node = node.left
+            elif point > node.center:
+                for start, end, value in node.by_end:
+                    if end < point:
+                        break
+                    found.append(value)
+                node = node.right
+            else:
+                found.extend(value for _, _, value in node.by_start)
+                break
+        return found
 
 class CalendarPage(QWidget):
     def __init__(self, main_window):
         super().__init__()
         self.main_window = main_window
+        # Events of the visible month grid, loaded once per page flip
+        self.month = None
+        self.month_range = None
+        self.event_tree = None
+        self.marked_days = False
         layout = QVBoxLayout(self)
 
         self.calendar = QCalendarWidget()
         self.calendar.selectionChanged.connect(self.update_events)
+        self.calendar.currentPageChanged.connect(self.load_month)
 
         self.event_list = QListWidget()
 
@@ -19,11 +68,53 @@ class CalendarPage(QWidget):
         layout.addWidget(self.event_list)
         layout.addWidget(add_event_button)
 
+        self.load_month(self.calendar.yearShown(), self.calendar.monthShown())
+
+    def load_month(self, year, month):
+        # The grid shows up to six weeks around the month; fetch every event overlapping them
+        first = QDate(year, month, 1)
+        start = first.addDays(-7).toString("yyyy-MM-dd")
+        end = first.addDays(42).toString("yyyy-MM-dd")
+        self.main_window.async_db.get_calendar_events(start, end,
+                                                      callback=lambda events: self.set_month_events((year, month),
+                                                                                                    (start, end),
+                                                                                                    events))
+
+    def set_month_events(self, month, month_range, events):
+        if month != (self.calendar.yearShown(), self.calendar.monthShown()):
+            return  # the page was flipped again while this query was running
+        self.month = month
+        self.month_range = month_range
+        self.event_tree = IntervalTree((event[2][:10], event[3][:10], event) for event in events)
+        self.mark_event_days(events)
         self.update_events()
 
+    def mark_event_days(self, events):
+        if self.marked_days:
+            self.calendar.setDateTextFormat(QDate(), QTextCharFormat())  # clears every date format
+        marker = QTextCharFormat()
+        marker.setFontWeight(QFont.Bold)
+        marker.setBackground(QColor("#BBDEFB"))
+        first = QDate.fromString(self.month_range[0], "yyyy-MM-dd")
+        last = QDate.fromString(self.month_range[1], "yyyy-MM-dd")
+        for event in events:
+            start, end = sorted((event[2][:10], event[3][:10]))
+            day = max(QDate.fromString(start, "yyyy-MM-dd"), first)
+            end = min(QDate.fromString(end, "yyyy-MM-dd"), last)
+            while day <= end:
+                self.calendar.setDateTextFormat(day, marker)
+                day = day.addDays(1)
+        self.marked_days = bool(events)
+
     def update_events(self):
+        # Served from the month's interval tree; a date outside it flips the page,
+        # and load_month shows its events once they arrive
         selected_date = self.calendar.selectedDate().toString("yyyy-MM-dd")
-        events = self.main_window.db.get_calendar_events(selected_date, selected_date)
+        if self.event_tree is None or not self.month_range[0] <= selected_date <= self.month_range[1]:
+            return
+        self.show_events(sorted(self.event_tree.query(selected_date), key=lambda event: event[2]))
+
+    def show_events(self, events):
         self.event_list.clear()
         for event in events:
             self.event_list.addItem(f"{event[1]} - {event[2]} to {event[3]}")
@@ -31,7 +122,7 @@ class CalendarPage(QWidget):
     def show_add_event_dialog(self):
         dialog = AddEventDialog(self.main_window)
         if dialog.exec_() == QDialog.Accepted:
-            self.update_events()
+            self.load_month(self.calendar.yearShown(), self.calendar.monthShown())
 
 class AddEventDialog(QDialog):
     def __init__(self, main_window):
@@ -63,5 +154,9 @@ class AddEventDialog(QDialog):
         description = self.description_input.toPlainText()
         event_type = self.event_type_input.text()
 
+        if self.end_date_input.dateTime() < self.start_date_input.dateTime():
+            self.main_window.show_error("Invalid Input", "The event cannot end before it starts.")
+            return
+
         self.main_window.db.add_calendar_event(title, start_date, end_date, description, event_type)
-        self.accept()
\ No newline at end of file
+        self.accept()
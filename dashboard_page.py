@@ -1,23 +1,51 @@
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
-                             QFrame, QScrollArea, QPushButton, QGraphicsDropShadowEffect)
+                             QFrame, QScrollArea, QPushButton, QGraphicsDropShadowEffect, QComboBox)
 from PyQt5.QtGui import QFont, QIcon, QColor
-from PyQt5.QtCore import Qt, QTimer, QPropertyAnimation, QEasingCurve
-from PyQt5.QtChart import QChart, QChartView, QLineSeries, QPieSeries, QBarSeries, QBarSet, QValueAxis, QBarCategoryAxis
-import random
+from PyQt5.QtCore import Qt, QTimer, QPropertyAnimation, QEasingCurve, QDateTime, QPointF
+from PyQt5.QtChart import (QChart, QChartView, QLineSeries, QPieSeries, QBarSeries, QBarSet, QValueAxis,
+                           QBarCategoryAxis, QDateTimeAxis)
 from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QPainter
 
 
+STATUS_COLORS = {
+    'Healthy': "#4CAF50",
+    'Warning': "#FFC107",
+    'Critical': "#F44336",
+}
+
 class DashboardPage(QWidget):
+    ACTIVITY_LIMIT = 8
+    # (label, span in ms, time axis format) for the performance chart
+    PERFORMANCE_RANGES = [
+        ("Last hour", 3600000, "HH:mm"),
+        ("Last day", 86400000, "HH:mm"),
+        ("Last week", 7 * 86400000, "MMM d"),
+        ("Last month", 30 * 86400000, "MMM d"),
+        ("Last year", 365 * 86400000, "MMM yyyy"),
+    ]
+
     def __init__(self, main_window):
         super().__init__()
         self.main_window = main_window
+        self.data_version = None
+        self.status_slices = {}
+        self.last_activity_id = 0
         self.setup_ui()
         
-        # Timer for updating dashboard data
+        # Timer for updating dashboard data, only running while the page is shown
         self.update_timer = QTimer(self)
+        self.update_timer.setInterval(5000)  # Update every 5 seconds
         self.update_timer.timeout.connect(self.update_dashboard)
-        self.update_timer.start(5000)  # Update every 5 seconds
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.update_dashboard()
+        self.update_timer.start()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.update_timer.stop()
 
     def setup_ui(self):
         layout = QVBoxLayout(self)
@@ -57,8 +85,21 @@ class DashboardPage(QWidget):
         charts_layout = QHBoxLayout()
         self.machine_status_chart = self.create_pie_chart("Machine Status Distribution")
         self.performance_chart = self.create_line_chart("Machine Performance Over Time")
+        # Telemetry of the machine picked above the line chart
+        self.telemetry_machine_input = QComboBox()
+        self.telemetry_machine_input.currentIndexChanged.connect(self.update_performance_chart)
+        self.telemetry_range_input = QComboBox()
+        for label, span, axis_format in self.PERFORMANCE_RANGES:
+            self.telemetry_range_input.addItem(label, (span, axis_format))
+        self.telemetry_range_input.currentIndexChanged.connect(self.update_performance_chart)
+        telemetry_inputs_layout = QHBoxLayout()
+        telemetry_inputs_layout.addWidget(self.telemetry_machine_input, 1)
+        telemetry_inputs_layout.addWidget(self.telemetry_range_input)
+        performance_layout = QVBoxLayout()
+        performance_layout.addLayout(telemetry_inputs_layout)
+        performance_layout.addWidget(self.performance_chart)
         charts_layout.addWidget(self.machine_status_chart)
-        charts_layout.addWidget(self.performance_chart)
+        charts_layout.addLayout(performance_layout)
         container_layout.addLayout(charts_layout)
         
         # Recent activities and Maintenance schedule
@@ -116,7 +157,8 @@ class DashboardPage(QWidget):
         chart.setTitle(title)
         chart.setAnimationOptions(QChart.SeriesAnimations)
         
-        axis_x = QValueAxis()
+        axis_x = QDateTimeAxis()
+        axis_x.setFormat("HH:mm:ss")
         axis_y = QValueAxis()
         chart.addAxis(axis_x, Qt.AlignBottom)
         chart.addAxis(axis_y, Qt.AlignLeft)
@@ -172,10 +214,29 @@ class DashboardPage(QWidget):
         return widget
 
     def update_dashboard(self):
+        # Skip the refresh entirely when nothing was written since the last one
+        data_version = self.main_window.db.get_data_version()
+        if data_version == self.data_version:
+            return
+        self.data_version = data_version
+
+        self.main_window.async_db.get_machine_status_counts(callback=self.update_stats)
+        
+        # Update line chart
+        self.main_window.async_db.get_telemetry_machines(callback=self.set_telemetry_machines)
+        
+        # Update recent activities
+        self.update_activities()
+        
+        # Update maintenance schedule
+        self.update_maintenance_schedule()
+
+    def update_stats(self, counts):
         # Update quick stats
-        machines = self.main_window.db.get_machines()
-        total_machines = len(machines)
-        healthy_machines = sum(1 for machine in machines if machine[7] == 'Healthy')
+        status_count = {'Healthy': 0, 'Warning': 0, 'Critical': 0}
+        status_count.update(counts)
+        total_machines = sum(status_count.values())
+        healthy_machines = status_count['Healthy']
         machines_in_alert = total_machines - healthy_machines
         
         self.animate_stat_change(self.total_machines.findChild(QLabel, "stat-value"), total_machines)
@@ -183,38 +244,88 @@ class DashboardPage(QWidget):
         self.animate_stat_change(self.machines_in_alert.findChild(QLabel, "stat-value"), machines_in_alert)
         
         # Update pie chart
+        self.update_status_chart(status_count)
+
+    def set_telemetry_machines(self, machines):
+        current = self.telemetry_machine_input.currentData()
+        shown = [self.telemetry_machine_input.itemData(i) for i in range(self.telemetry_machine_input.count())]
+        if shown != [machine_id for machine_id, _ in machines]:
+            self.telemetry_machine_input.blockSignals(True)
+            self.telemetry_machine_input.clear()
+            for machine_id, name in machines:
+                self.telemetry_machine_input.addItem(name, machine_id)
+            index = self.telemetry_machine_input.findData(current)
+            self.telemetry_machine_input.setCurrentIndex(max(index, 0))
+            self.telemetry_machine_input.blockSignals(False)
+        self.update_performance_chart()
+
+    def update_performance_chart(self):
+        # One averaged point per horizontal pixel of the plot, read from the rollup tier
+        # that matches the range, so every range costs about the same to query and draw
+        machine_id = self.telemetry_machine_input.currentData()
+        span, axis_format = self.telemetry_range_input.currentData()
+        selection = (machine_id, span)
+        if machine_id is None:
+            self.show_performance(selection, axis_format, 0, 0, [])
+            return
+        end_ts = QDateTime.currentMSecsSinceEpoch()
+        start_ts = end_ts - span
+        points = max(int(self.performance_chart.chart().plotArea().width()), 100)
+        self.main_window.async_db.get_telemetry_series(
+            machine_id, start_ts, end_ts, points,
+            callback=lambda series: self.show_performance(selection, axis_format, start_ts, end_ts, series))
+
+    def show_performance(self, selection, axis_format, start_ts, end_ts, series):
+        if selection != (self.telemetry_machine_input.currentData(), self.telemetry_range_input.currentData()[0]):
+            return  # another machine or range was picked while this query was running
+        chart = self.performance_chart.chart()
+        # replace() swaps all points in one call instead of one signal per append()
+        chart.series()[0].replace([QPointF(ts, average) for ts, _, _, average, _ in series])
+        if series:
+            axis_x = chart.axes(Qt.Horizontal)[0]
+            axis_y = chart.axes(Qt.Vertical)[0]
+            axis_x.setFormat(axis_format)
+            axis_x.setRange(QDateTime.fromMSecsSinceEpoch(start_ts), QDateTime.fromMSecsSinceEpoch(end_ts))
+            low = min(average for _, _, _, average, _ in series)
+            high = max(average for _, _, _, average, _ in series)
+            axis_y.setRange(low, high if high > low else low + 1)
+
+    def update_status_chart(self, status_count):
+        # Update slices in place; only changed values touch the series
         pie_series = self.machine_status_chart.chart().series()[0]
-        pie_series.clear()
-        status_count = {'Healthy': healthy_machines, 'Warning': 0, 'Critical': 0}
-        for machine in machines:
-            if machine[7] != 'Healthy':
-                status_count[machine[7]] += 1
+        for status in list(self.status_slices):
+            if status not in status_count:
+                pie_series.remove(self.status_slices.pop(status))
         for status, count in status_count.items():
-            slice = pie_series.append(status, count)
-            if status == 'Healthy':
-                slice.setBrush(QColor("#4CAF50"))
-            elif status == 'Warning':
-                slice.setBrush(QColor("#FFC107"))
+            slice = self.status_slices.get(status)
+            if slice is None:
+                slice = pie_series.append(status, count)
+                slice.setBrush(QColor(STATUS_COLORS.get(status, "#9E9E9E")))
+                self.status_slices[status] = slice
+            elif slice.value() != count:
+                slice.setValue(count)
+
+    def set_list_items(self, list_layout, texts, object_name):
+        # Reuse the existing labels and only touch the ones whose text differs
+        for i in reversed(range(len(texts), list_layout.count())):
+            list_layout.itemAt(i).widget().setParent(None)
+        for i, text in enumerate(texts):
+            if i < list_layout.count():
+                label = list_layout.itemAt(i).widget()
+                if label.text() != text:
+                    label.setText(text)
             else:
-                slice.setBrush(QColor("#F44336"))
-        
-        # Update line chart
-        line_series = self.performance_chart.chart().series()[0]
-        line_series.clear()
-        for i in range(10):
-            line_series.append(i, random.randint(50, 100))
-        
-        # Update recent activities
-        self.update_activities()
-        
-        # Update maintenance schedule
-        self.update_maintenance_schedule()
+                label = QLabel(text)
+                label.setObjectName(object_name)
+                list_layout.addWidget(label)
 
     def animate_stat_change(self, label, new_value):
         try:
             old_value = int(label.text())  # Ensure old_value is an integer
         except ValueError:
             old_value = 0  # Fallback to 0 if the label's text is not a valid integer
+        if old_value == new_value:
+            return
         
         # Create an animation for the 'text' property
         animation = QPropertyAnimation(label, b"text")
@@ -230,38 +341,31 @@ class DashboardPage(QWidget):
         
 
     def update_activities(self):
-        # Clear existing activities
-        for i in reversed(range(self.activities_list.count())): 
-            self.activities_list.itemAt(i).widget().setParent(None)
-        
-        # Add new activities (this is a placeholder, replace with actual data)
-        activities = [
-            "Machine A001 status changed to Warning",
-            "Maintenance performed on Machine B002",
-            "New user 'John Doe' added to the system",
-            "Inventory low alert for Item X",
-            "Work order #123 completed"
-        ]
-        for activity in activities:
-            label = QLabel(activity)
-            label.setObjectName("activity-item")
-            self.activities_list.addWidget(label)
+        # Only events after the newest one shown are fetched
+        self.main_window.async_db.get_activity_since(self.last_activity_id, limit=self.ACTIVITY_LIMIT,
+                                                     callback=self.show_new_activities)
+
+    def show_new_activities(self, activities):
+        # The labels form a ring buffer: each new event takes a fresh label until
+        # ACTIVITY_LIMIT exist, then recycles the oldest one from the bottom to the top.
+        for activity_id, created_at, _, _, message in activities:
+            if activity_id <= self.last_activity_id:
+                continue
+            self.last_activity_id = activity_id
+            if self.activities_list.count() < self.ACTIVITY_LIMIT:
+                label = QLabel()
+                label.setObjectName("activity-item")
+            else:
+                label = self.activities_list.itemAt(self.activities_list.count() - 1).widget()
+                self.activities_list.removeWidget(label)
+            label.setText(f"{created_at[11:16]}  {message}")
+            self.activities_list.insertWidget(0, label)
 
     def update_maintenance_schedule(self):
-        # Clear existing schedule items
-        for i in reversed(range(self.maintenance_list.count())): 
-            self.maintenance_list.itemAt(i).widget().setParent(None)
-        
-        # Add new schedule items (this is a placeholder, replace with actual data)
-        schedule = [
-            ("Machine A001", "2023-06-15"),
-            ("Machine B002", "2023-06-18"),
-            ("Machine C003", "2023-06-20"),
-            ("Machine D004", "2023-06-22"),
-            ("Machine E005", "2023-06-25")
-        ]
-        for machine, date in schedule:
-            label = QLabel(f"{machine} - {date}")
-            label.setObjectName("maintenance-item")
-            self.maintenance_list.addWidget(label)
+        self.main_window.async_db.get_upcoming_maintenance(limit=5, horizon_days=30,
+                                                           callback=self.show_maintenance_schedule)
+
+    def show_maintenance_schedule(self, schedule):
+        self.set_list_items(self.maintenance_list, [f"{name} - {date}" for _, name, date in schedule],
+                            "maintenance-item")
 
@@ -1,12 +1,166 @@
 import sqlite3
 import hashlib
+import json
+import re
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from itertools import islice
 from datetime import datetime, timedelta
 
+from migrations import MIGRATIONS
+
+# Connection profiles: PRAGMA settings applied when the connection is opened.
+# 'default' is SQLite's own settings, spelled out because journal_mode persists in the file.
+CONNECTION_PROFILES = {
+    'default': {
+        'journal_mode': 'DELETE',
+        'synchronous': 'FULL',
+        'cache_size': -2000,
+        'temp_store': 'DEFAULT',
+        'mmap_size': 0,
+    },
+    'balanced': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'cache_size': -65536,  # negative values are KiB, so 64 MiB
+        'temp_store': 'MEMORY',
+        'mmap_size': 268435456,
+    },
+    'fast': {
+        'journal_mode': 'WAL',
+        'synchronous': 'OFF',
+        'cache_size': -262144,
+        'temp_store': 'MEMORY',
+        'mmap_size': 1073741824,
+    },
+}
+
+PRAGMA_VALUES = {
+    'journal_mode': {'DELETE', 'TRUNCATE', 'PERSIST', 'MEMORY', 'WAL', 'OFF'},
+    'synchronous': {'OFF', 'NORMAL', 'FULL', 'EXTRA'},
+    'temp_store': {'DEFAULT', 'FILE', 'MEMORY'},
+    'cache_size': int,
+    'mmap_size': int,
+}
+
+# Full-text search sources: kind -> (FTS table, query returning id, title, snippet, bm25 rank and
+# the id of the row to show on the kind's list page)
+SEARCH_KINDS = {
+    'work_order': ('work_orders_fts', '''
+        SELECT work_orders.id, '#' || work_orders.id || ' ' || work_orders.title,
+               snippet(work_orders_fts, -1, '[', ']', '...', 12), bm25(work_orders_fts), work_orders.id
+        FROM work_orders_fts
+        JOIN work_orders ON work_orders.id = work_orders_fts.rowid
+        WHERE work_orders_fts MATCH ?
+        ORDER BY bm25(work_orders_fts)
+        LIMIT ?
+    '''),
+    'inspection': ('inspections_fts', '''
+        SELECT inspections.id, COALESCE(machines.name, 'Machine ' || inspections.machine_id) || ' inspection ' ||
+               inspections.inspection_date,
+               snippet(inspections_fts, -1, '[', ']', '...', 12), bm25(inspections_fts), inspections.id
+        FROM inspections_fts
+        JOIN inspections ON inspections.id = inspections_fts.rowid
+        LEFT JOIN machines ON machines.id = inspections.machine_id
+        WHERE inspections_fts MATCH ?
+        ORDER BY bm25(inspections_fts)
+        LIMIT ?
+    '''),
+    'maintenance': ('maintenance_history_fts', '''
+        SELECT maintenance_history.id, COALESCE(machines.name, 'Machine ' || maintenance_history.machine_id) ||
+               ' maintenance ' || maintenance_history.maintenance_date,
+               snippet(maintenance_history_fts, -1, '[', ']', '...', 12), bm25(maintenance_history_fts),
+               maintenance_history.machine_id
+        FROM maintenance_history_fts
+        JOIN maintenance_history ON maintenance_history.id = maintenance_history_fts.rowid
+        LEFT JOIN machines ON machines.id = maintenance_history.machine_id
+        WHERE maintenance_history_fts MATCH ?
+        ORDER BY bm25(maintenance_history_fts)
+        LIMIT ?
+    '''),
+}
+
+# Telemetry rollup tiers, coarsest first: (table, bucket width in ms)
+TELEMETRY_ROLLUPS = [
+    ('telemetry_1d', 86400000),
+    ('telemetry_1h', 3600000),
+    ('telemetry_1m', 60000),
+]
+
 class Database:
-    def __init__(self, db_name='dashboard.db'):
+    MACHINE_CACHE_SIZE = 256
+    JOURNAL_MODE_TIMEOUT = 5.0
+
+    def __init__(self, db_name='dashboard.db', profile='balanced', pragmas=None, config_file=None):
+        # Settings are layered: the profile, then a JSON config file
+        # ({"profile": ..., "pragmas": {...}}), then explicit pragmas.
+        settings = {}
+        if config_file:
+            with open(config_file) as f:
+                config = json.load(f)
+            profile = config.get('profile', profile)
+            settings.update(config.get('pragmas', {}))
+        if profile not in CONNECTION_PROFILES:
+            raise ValueError(f"Unknown connection profile: {profile}")
+        settings = {**CONNECTION_PROFILES[profile], **settings, **(pragmas or {})}
+
         self.conn = sqlite3.connect(db_name)
         self.cursor = self.conn.cursor()
+        self.apply_pragmas(settings)
+        self.machine_cache = OrderedDict()
+        self.machine_cache_changes = None
+        self.transaction_depth = 0
         self.create_tables()
+        self.migrate()
+
+    def apply_pragmas(self, settings):
+        for name, value in settings.items():
+            allowed = PRAGMA_VALUES.get(name)
+            if allowed is None:
+                raise ValueError(f"Unsupported pragma: {name}")
+            if allowed is int:
+                value = int(value)
+            elif str(value).upper() not in allowed:
+                raise ValueError(f"Invalid value for {name}: {value}")
+            else:
+                value = str(value).upper()
+            if name == 'journal_mode':
+                self.set_journal_mode(value)
+                continue
+            self.cursor.execute(f"PRAGMA {name} = {value}")
+            self.cursor.fetchall()
+
+    def set_journal_mode(self, mode):
+        # Switching the journal mode needs the file to itself, and SQLite fails at once rather
+        # than waiting, so retry while other processes opening the same file let go. If they
+        # never do, keep the current mode rather than fail to start.
+        deadline = time.monotonic() + self.JOURNAL_MODE_TIMEOUT
+        while True:
+            try:
+                self.cursor.execute(f"PRAGMA journal_mode = {mode}")
+                self.cursor.fetchall()
+                return
+            except sqlite3.OperationalError as e:
+                error = e
+            try:
+                self.cursor.execute("PRAGMA journal_mode")
+                if self.cursor.fetchone()[0].upper() == mode:
+                    return  # another connection switched it meanwhile
+            except sqlite3.OperationalError:
+                pass
+            if time.monotonic() > deadline:
+                print(f"Could not set journal_mode to {mode}, keeping the current mode: {error}")
+                return
+            time.sleep(0.05)
+
+    def get_connection_settings(self):
+        settings = {}
+        for name in PRAGMA_VALUES:
+            self.cursor.execute(f"PRAGMA {name}")
+            row = self.cursor.fetchone()
+            settings[name] = row[0] if row else None
+        return settings
 
     def create_tables(self):
         self.cursor.execute('''
@@ -100,19 +254,96 @@ class Database:
 
         self.conn.commit()
 
+    def migrate(self):
+        self.cursor.execute('''
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            applied_at TEXT NOT NULL
+        )
+        ''')
+        self.conn.commit()
+
+        current_version = self.get_schema_version()
+        for version, statements in MIGRATIONS:
+            if version <= current_version:
+                continue
+            try:
+                # Take the write lock before re-reading the version: another process opening
+                # the same file (the app, the sweep, the telemetry feeder) may have applied it
+                self.cursor.execute("BEGIN IMMEDIATE")
+                if self.get_schema_version() >= version:
+                    self.conn.commit()
+                    continue
+                for statement in statements:
+                    self.cursor.execute(statement)
+                self.cursor.execute("INSERT INTO schema_version (version, applied_at) VALUES (?, ?)",
+                                    (version, datetime.now().strftime('%Y-%m-%d %H:%M:%S')))
+                self.conn.commit()
+            except sqlite3.Error:
+                self.conn.rollback()
+                raise
+
+    @contextmanager
+    def transaction(self):
+        # Groups writes into one commit: repository methods called inside the block
+        # skip their own commit. The outermost block takes the write lock up front
+        # (BEGIN IMMEDIATE), so a block that reads before it writes cannot lose a race
+        # with another connection. Nested blocks are savepoints: an exception rolls back
+        # only that block's writes, and the outer block decides whether to commit.
+        savepoint = None
+        if self.transaction_depth:
+            savepoint = f"transaction_{self.transaction_depth}"
+            self.cursor.execute(f"SAVEPOINT {savepoint}")
+        elif not self.conn.in_transaction:
+            self.cursor.execute("BEGIN IMMEDIATE")
+        self.transaction_depth += 1
+        try:
+            yield self
+        except BaseException:
+            self.transaction_depth -= 1
+            if savepoint:
+                self.cursor.execute(f"ROLLBACK TO {savepoint}")
+                self.cursor.execute(f"RELEASE {savepoint}")
+            else:
+                self.conn.rollback()
+            raise
+        self.transaction_depth -= 1
+        if savepoint:
+            self.cursor.execute(f"RELEASE {savepoint}")
+        else:
+            self.conn.commit()
+
+    def commit(self):
+        if self.transaction_depth == 0:
+            self.conn.commit()
+
+    def get_schema_version(self):
+        self.cursor.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version")
+        return self.cursor.fetchone()[0]
+
+    def get_data_version(self):
+        # Changes whenever this connection writes (total_changes) or another connection
+        # commits to the same file (PRAGMA data_version), so readers can skip unchanged data.
+        self.cursor.execute("PRAGMA data_version")
+        return (self.conn.total_changes, self.cursor.fetchone()[0])
+
     def add_user(self, username, password, role):
         hashed_password = hashlib.sha256(password.encode()).hexdigest()
         try:
             self.cursor.execute("INSERT INTO users (username, password, role) VALUES (?, ?, ?)",
                                 (username, hashed_password, role))
-            self.conn.commit()
+            self.commit()
             return True
         except sqlite3.IntegrityError:
             return False
 
     def validate_user(self, user_id):
         self.cursor.execute("UPDATE users SET is_validated = 1 WHERE id = ?", (user_id,))
-        self.conn.commit()
+        self.commit()
+
+    def delete_user(self, user_id):
+        self.cursor.execute("DELETE FROM users WHERE id = ?", (user_id,))
+        self.commit()
 
     def authenticate_user(self, username, password):
         hashed_password = hashlib.sha256(password.encode()).hexdigest()
@@ -122,8 +353,9 @@ class Database:
             return user
         return None
 
-    def get_users(self):
-        self.cursor.execute("SELECT id, username, role, is_validated FROM users")
+    def get_users(self, *, after_id=0, limit=-1):
+        self.cursor.execute("SELECT id, username, role, is_validated FROM users WHERE id > ? ORDER BY id LIMIT ?",
+                            (after_id, limit))
         return self.cursor.fetchall()
 
     def add_machine(self, name, machine_type, location, installation_date, maintenance_frequency):
@@ -131,15 +363,82 @@ class Database:
         INSERT INTO machines (name, type, location, installation_date, maintenance_frequency, status)
         VALUES (?, ?, ?, ?, ?, ?)
         ''', (name, machine_type, location, installation_date, maintenance_frequency, 'Healthy'))
-        self.conn.commit()
+        self.commit()
 
-    def get_machines(self):
-        self.cursor.execute("SELECT * FROM machines")
+    def get_machines(self, *, after_id=0, limit=-1):
+        self.cursor.execute("SELECT * FROM machines WHERE id > ? ORDER BY id LIMIT ?", (after_id, limit))
         return self.cursor.fetchall()
 
+    def get_machine(self, machine_id):
+        # Small LRU cache; any write on this connection (total_changes moves) or commit from
+        # another one, such as the background writer (data_version moves), invalidates it.
+        changes = self.get_data_version()
+        if changes != self.machine_cache_changes:
+            self.machine_cache.clear()
+            self.machine_cache_changes = changes
+        if machine_id in self.machine_cache:
+            self.machine_cache.move_to_end(machine_id)
+            return self.machine_cache[machine_id]
+        self.cursor.execute("SELECT * FROM machines WHERE id = ?", (machine_id,))
+        machine = self.cursor.fetchone()
+        self.machine_cache[machine_id] = machine
+        if len(self.machine_cache) > self.MACHINE_CACHE_SIZE:
+            self.machine_cache.popitem(last=False)
+        return machine
+
+    def get_machine_status_counts(self, use_summary=True):
+        # The summary table is kept current by triggers, so this is O(#statuses);
+        # use_summary=False falls back to a GROUP BY over the status index.
+        if use_summary:
+            self.cursor.execute("SELECT status, count FROM machine_status_summary WHERE count > 0")
+        else:
+            self.cursor.execute("SELECT status, COUNT(*) FROM machines GROUP BY status")
+        return dict(self.cursor.fetchall())
+
+    def update_machine(self, machine_id, name, machine_type, location, installation_date, maintenance_frequency,
+                       status):
+        self.cursor.execute('''
+        UPDATE machines
+        SET name = ?, type = ?, location = ?, installation_date = ?, maintenance_frequency = ?, status = ?
+        WHERE id = ?
+        ''', (name, machine_type, location, installation_date, maintenance_frequency, status, machine_id))
+        self.commit()
+
     def update_machine_status(self, machine_id, status):
         self.cursor.execute("UPDATE machines SET status = ? WHERE id = ?", (status, machine_id))
-        self.conn.commit()
+        self.commit()
+
+    def get_status_sweep_batch(self, today, limit):
+        # (queued machine ids, machines to rescore): up to limit machines from the change
+        # queue plus up to limit machines whose status_check_date has been reached
+        self.cursor.execute("SELECT machine_id FROM status_sweep_queue ORDER BY machine_id LIMIT ?", (limit,))
+        queued = [row[0] for row in self.cursor.fetchall()]
+        self.cursor.execute('''
+        SELECT * FROM machines WHERE id IN (SELECT machine_id FROM status_sweep_queue ORDER BY machine_id LIMIT ?)
+        UNION
+        SELECT * FROM (SELECT * FROM machines WHERE status_check_date <= ? LIMIT ?)
+        ''', (limit, today, limit))
+        return queued, self.cursor.fetchall()
+
+    def queue_all_machines_for_sweep(self):
+        self.cursor.execute("INSERT OR IGNORE INTO status_sweep_queue (machine_id) SELECT id FROM machines")
+        self.commit()
+
+    def save_status_sweep_batch(self, updates, queued_ids):
+        # updates: (status, status_check_date, machine id) tuples
+        self.cursor.executemany("UPDATE machines SET status = ?, status_check_date = ? WHERE id = ?", updates)
+        self.cursor.executemany("DELETE FROM status_sweep_queue WHERE machine_id = ?",
+                                [(machine_id,) for machine_id in queued_ids])
+        self.commit()
+
+    def add_sweep_run(self, started_at, duration_ms, rescored, changed):
+        self.cursor.execute("INSERT INTO sweep_runs (started_at, duration_ms, rescored, changed) VALUES (?, ?, ?, ?)",
+                            (started_at, duration_ms, rescored, changed))
+        self.commit()
+
+    def get_sweep_runs(self, limit=20):
+        self.cursor.execute("SELECT * FROM sweep_runs ORDER BY id DESC LIMIT ?", (limit,))
+        return self.cursor.fetchall()
 
     def add_maintenance(self, machine_id, description):
         current_date = datetime.now().strftime('%Y-%m-%d')
@@ -147,25 +446,142 @@ class Database:
         INSERT INTO maintenance_history (machine_id, maintenance_date, description)
         VALUES (?, ?, ?)
         ''', (machine_id, current_date, description))
+        maintenance_id = self.cursor.lastrowid
         self.cursor.execute("UPDATE machines SET last_maintenance_date = ? WHERE id = ?", (current_date, machine_id))
-        self.conn.commit()
+        self.commit()
+        return maintenance_id
+
+    def log_maintenance_with_parts(self, machine_id, description, parts):
+        # parts: (inventory item id, quantity) pairs. The maintenance row, the parts_used
+        # rows and every stock decrement commit together; each decrement only applies while
+        # enough stock remains, so if any part is short nothing is recorded and a ValueError
+        # names the short items.
+        needed = {}
+        for item_id, quantity in parts:
+            if quantity <= 0:
+                raise ValueError("Part quantities must be positive")
+            needed[item_id] = needed.get(item_id, 0) + quantity
+        try:
+            with self.transaction():
+                maintenance_id = self.add_maintenance(machine_id, description)
+                self.cursor.executemany("UPDATE inventory SET quantity = quantity - ? WHERE id = ? AND quantity >= ?",
+                                        [(quantity, item_id, quantity) for item_id, quantity in needed.items()])
+                if needed and self.cursor.rowcount != len(needed):
+                    raise ValueError("Not enough stock")
+                self.cursor.executemany("INSERT INTO parts_used (maintenance_id, item_id, quantity) VALUES (?, ?, ?)",
+                                        [(maintenance_id, item_id, quantity) for item_id, quantity in needed.items()])
+        except ValueError:
+            raise ValueError("Not enough stock for: " + ", ".join(self.get_stock_shortfalls(needed))) from None
+        return maintenance_id
+
+    def get_stock_shortfalls(self, needed):
+        # Names of the items in {item id: quantity} that don't have that much stock
+        self.cursor.execute(f"SELECT id, item_name, quantity FROM inventory WHERE id IN ({', '.join('?' * len(needed))})",
+                            list(needed))
+        stock = {item_id: (name, quantity) for item_id, name, quantity in self.cursor.fetchall()}
+        shortfalls = []
+        for item_id, quantity in needed.items():
+            if item_id not in stock:
+                shortfalls.append(f"unknown item #{item_id}")
+            elif stock[item_id][1] < quantity:
+                shortfalls.append(f"{stock[item_id][0]} ({stock[item_id][1]} of {quantity} in stock)")
+        return shortfalls
+
+    def get_parts_used(self, maintenance_id):
+        # (item id, item name, quantity, unit) for one maintenance_history row
+        self.cursor.execute('''
+        SELECT parts_used.item_id, inventory.item_name, parts_used.quantity, inventory.unit
+        FROM parts_used
+        LEFT JOIN inventory ON inventory.id = parts_used.item_id
+        WHERE parts_used.maintenance_id = ?
+        ''', (maintenance_id,))
+        return self.cursor.fetchall()
+
+    def get_upcoming_maintenance(self, limit=5, horizon_days=30):
+        # Range scan on idx_machines_next_maintenance; overdue machines come first
+        horizon = (datetime.now() + timedelta(days=horizon_days)).strftime('%Y-%m-%d')
+        self.cursor.execute('''
+        SELECT id, name, next_maintenance_date FROM machines
+        WHERE next_maintenance_date <= ?
+        ORDER BY next_maintenance_date
+        LIMIT ?
+        ''', (horizon, limit))
+        return self.cursor.fetchall()
 
     def get_maintenance_history(self, machine_id):
         self.cursor.execute("SELECT * FROM maintenance_history WHERE machine_id = ?", (machine_id,))
         return self.cursor.fetchall()
 
+    def get_maintenance_intervals(self, after_id, up_to_id):
+        # (machine type, days since the machine's previous maintenance or installation)
+        # for history rows in (after_id, up_to_id]
+        self.cursor.execute('''
+        SELECT machines.type,
+               julianday(h.maintenance_date) - julianday(COALESCE(
+                   (SELECT MAX(p.maintenance_date) FROM maintenance_history p
+                    WHERE p.machine_id = h.machine_id AND p.maintenance_date <= h.maintenance_date AND p.id < h.id),
+                   machines.installation_date))
+        FROM maintenance_history h
+        JOIN machines ON machines.id = h.machine_id
+        WHERE h.id > ? AND h.id <= ?
+        ''', (after_id, up_to_id))
+        return self.cursor.fetchall()
+
+    def get_inspection_outcomes(self, after_id, up_to_id):
+        # (machine type, 1 if the inspection failed else 0) for inspections in (after_id, up_to_id]
+        self.cursor.execute('''
+        SELECT machines.type, inspections.result = 'Fail'
+        FROM inspections
+        JOIN machines ON machines.id = inspections.machine_id
+        WHERE inspections.id > ? AND inspections.id <= ?
+        ''', (after_id, up_to_id))
+        return self.cursor.fetchall()
+
+    def get_failure_model_state(self):
+        # (last fitted history id, last fitted inspection id, current max history id, current max inspection id)
+        self.cursor.execute('''
+        SELECT last_history_id, last_inspection_id,
+               (SELECT COALESCE(MAX(id), 0) FROM maintenance_history),
+               (SELECT COALESCE(MAX(id), 0) FROM inspections)
+        FROM failure_model_state WHERE id = 1
+        ''')
+        return self.cursor.fetchone()
+
+    def get_failure_model_params(self):
+        self.cursor.execute('''
+        SELECT machine_type, intervals, interval_sum, interval_sum_sq, inspections, failures,
+               weibull_shape, weibull_scale
+        FROM failure_model_params
+        ''')
+        return self.cursor.fetchall()
+
+    def save_failure_model_params(self, params, last_history_id, last_inspection_id):
+        updated_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        self.cursor.executemany('''
+        INSERT OR REPLACE INTO failure_model_params (machine_type, intervals, interval_sum, interval_sum_sq,
+                                                     inspections, failures, weibull_shape, weibull_scale, updated_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', [tuple(row) + (updated_at,) for row in params])
+        self.cursor.execute("UPDATE failure_model_state SET last_history_id = ?, last_inspection_id = ? WHERE id = 1",
+                            (last_history_id, last_inspection_id))
+        self.commit()
+
     def add_calendar_event(self, title, start_date, end_date, description, event_type):
         self.cursor.execute('''
         INSERT INTO calendar_events (title, start_date, end_date, description, event_type)
         VALUES (?, ?, ?, ?, ?)
         ''', (title, start_date, end_date, description, event_type))
-        self.conn.commit()
+        self.commit()
 
     def get_calendar_events(self, start_date, end_date):
+        # Events overlapping the days start_date..end_date ('yyyy-MM-dd', inclusive).
+        # Stored bounds may be dates or 'yyyy-MM-dd HH:mm:ss' datetimes, so the range is
+        # widened to the first and last moment of those days before comparing the strings.
         self.cursor.execute('''
         SELECT * FROM calendar_events
-        WHERE start_date >= ? AND end_date <= ?
-        ''', (start_date, end_date))
+        WHERE start_date <= ? AND end_date >= ?
+        ORDER BY start_date
+        ''', (end_date[:10] + ' 23:59:59', start_date[:10]))
         return self.cursor.fetchall()
 
     def add_inspection(self, machine_id, inspection_date, inspector, result, notes):
@@ -173,13 +589,29 @@ class Database:
         INSERT INTO inspections (machine_id, inspection_date, inspector, result, notes)
         VALUES (?, ?, ?, ?, ?)
         ''', (machine_id, inspection_date, inspector, result, notes))
-        self.conn.commit()
+        self.commit()
 
-    def get_inspections(self, machine_id=None):
+    def get_inspections(self, machine_id=None, *, after_id=0, limit=-1):
         if machine_id:
-            self.cursor.execute('SELECT * FROM inspections WHERE machine_id = ?', (machine_id,))
+            self.cursor.execute('SELECT * FROM inspections WHERE machine_id = ? AND id > ? ORDER BY id LIMIT ?',
+                                (machine_id, after_id, limit))
         else:
-            self.cursor.execute('SELECT * FROM inspections')
+            self.cursor.execute('SELECT * FROM inspections WHERE id > ? ORDER BY id LIMIT ?', (after_id, limit))
+        return self.cursor.fetchall()
+
+    def get_inspections_with_machine(self, machine_id=None, *, after_id=0, limit=-1):
+        # Inspection columns followed by the machine name
+        query = '''
+        SELECT inspections.*, machines.name
+        FROM inspections
+        LEFT JOIN machines ON machines.id = inspections.machine_id
+        WHERE inspections.id > ?
+        '''
+        params = [after_id]
+        if machine_id:
+            query += ' AND inspections.machine_id = ?'
+            params.append(machine_id)
+        self.cursor.execute(query + ' ORDER BY inspections.id LIMIT ?', params + [limit])
         return self.cursor.fetchall()
 
     def add_resource(self, name, type, status, location):
@@ -187,10 +619,18 @@ class Database:
         INSERT INTO resources (name, type, status, location)
         VALUES (?, ?, ?, ?)
         ''', (name, type, status, location))
-        self.conn.commit()
+        self.commit()
 
-    def get_resources(self):
-        self.cursor.execute('SELECT * FROM resources')
+    def update_resource(self, resource_id, name, type, status, location):
+        self.cursor.execute('''
+        UPDATE resources
+        SET name = ?, type = ?, status = ?, location = ?
+        WHERE id = ?
+        ''', (name, type, status, location, resource_id))
+        self.commit()
+
+    def get_resources(self, *, after_id=0, limit=-1):
+        self.cursor.execute('SELECT * FROM resources WHERE id > ? ORDER BY id LIMIT ?', (after_id, limit))
         return self.cursor.fetchall()
 
     def add_work_order(self, title, description, status, priority, assigned_to, due_date):
@@ -198,10 +638,30 @@ class Database:
         INSERT INTO work_orders (title, description, status, priority, assigned_to, due_date)
         VALUES (?, ?, ?, ?, ?, ?)
         ''', (title, description, status, priority, assigned_to, due_date))
-        self.conn.commit()
+        self.commit()
+
+    def update_work_order(self, work_order_id, title, description, status, priority, assigned_to, due_date):
+        self.cursor.execute('''
+        UPDATE work_orders
+        SET title = ?, description = ?, status = ?, priority = ?, assigned_to = ?, due_date = ?
+        WHERE id = ?
+        ''', (title, description, status, priority, assigned_to, due_date, work_order_id))
+        self.commit()
+
+    def get_work_orders(self, *, after_id=0, limit=-1):
+        self.cursor.execute('SELECT * FROM work_orders WHERE id > ? ORDER BY id LIMIT ?', (after_id, limit))
+        return self.cursor.fetchall()
 
-    def get_work_orders(self):
-        self.cursor.execute('SELECT * FROM work_orders')
+    def get_work_orders_with_assignees(self, *, after_id=0, limit=-1):
+        # Work order columns followed by the assignee's username (NULL when unassigned)
+        self.cursor.execute('''
+        SELECT work_orders.*, users.username
+        FROM work_orders
+        LEFT JOIN users ON users.id = work_orders.assigned_to
+        WHERE work_orders.id > ?
+        ORDER BY work_orders.id
+        LIMIT ?
+        ''', (after_id, limit))
         return self.cursor.fetchall()
 
     def add_inventory_item(self, item_name, quantity, unit, reorder_level):
@@ -209,12 +669,230 @@ class Database:
         INSERT INTO inventory (item_name, quantity, unit, reorder_level)
         VALUES (?, ?, ?, ?)
         ''', (item_name, quantity, unit, reorder_level))
-        self.conn.commit()
+        self.commit()
+
+    def update_inventory_item(self, item_id, item_name, quantity, unit, reorder_level):
+        self.cursor.execute('''
+        UPDATE inventory
+        SET item_name = ?, quantity = ?, unit = ?, reorder_level = ?
+        WHERE id = ?
+        ''', (item_name, quantity, unit, reorder_level, item_id))
+        self.commit()
+
+    def get_inventory(self, *, after_id=0, limit=-1):
+        self.cursor.execute('SELECT * FROM inventory WHERE id > ? ORDER BY id LIMIT ?', (after_id, limit))
+        return self.cursor.fetchall()
+
+    def search_inventory(self, prefix, limit=50):
+        # Items whose name starts with prefix (case-insensitive), read through idx_inventory_name
+        pattern = re.sub(r'([\\%_])', r'\\\1', prefix) + '%'
+        self.cursor.execute('''
+        SELECT * FROM inventory
+        WHERE item_name LIKE ? ESCAPE '\\'
+        ORDER BY item_name COLLATE NOCASE
+        LIMIT ?
+        ''', (pattern, limit))
+        return self.cursor.fetchall()
+
+    def get_low_stock_items(self, *, after_id=0, limit=-1):
+        # Inventory rows at or below their reorder level, read through idx_inventory_low_stock
+        self.cursor.execute('''
+        SELECT * FROM inventory
+        WHERE quantity <= reorder_level AND id > ?
+        ORDER BY id
+        LIMIT ?
+        ''', (after_id, limit))
+        return self.cursor.fetchall()
+
+    def get_low_stock_count(self):
+        self.cursor.execute("SELECT COUNT(*) FROM low_stock")
+        return self.cursor.fetchone()[0]
+
+    def get_low_stock_queue(self):
+        # (item id, item name, shortfall, flagged at), longest-standing shortfalls first
+        self.cursor.execute('''
+        SELECT low_stock.item_id, inventory.item_name, low_stock.shortfall, low_stock.flagged_at
+        FROM low_stock
+        JOIN inventory ON inventory.id = low_stock.item_id
+        ORDER BY low_stock.flagged_at, low_stock.item_id
+        ''')
+        return self.cursor.fetchall()
+
+    def get_activity_since(self, last_id=0, limit=50):
+        # Up to limit of the newest activity_log rows with id > last_id, oldest first:
+        # (id, created_at, kind, entity_id, message)
+        self.cursor.execute('''
+        SELECT * FROM (SELECT * FROM activity_log WHERE id > ? ORDER BY id DESC LIMIT ?)
+        ORDER BY id
+        ''', (last_id, limit))
+        return self.cursor.fetchall()
+
+    def search(self, query, kinds=None, limit=20):
+        # Full-text search over work orders, inspection notes and maintenance history.
+        # Returns up to limit (kind, id, title, snippet, rank, page row id) tuples; matched
+        # terms are wrapped in [brackets] in the snippet. The text is treated as plain words
+        # (all required, the last one as a prefix), never as FTS5 syntax. bm25 scores are
+        # only comparable within one FTS table, so the kinds are interleaved: every kind's
+        # best hit, then every kind's second best, and so on, by rank within each round.
+        words = re.findall(r'\w+', query)
+        if not words:
+            return []
+        match = ' '.join(f'"{word}"' for word in words) + '*'
+        results = []
+        for kind in kinds or SEARCH_KINDS:
+            if kind not in SEARCH_KINDS:
+                raise ValueError(f"Unknown search kind: {kind}")
+            self.cursor.execute(SEARCH_KINDS[kind][1], (match, limit))
+            results.extend((position, (kind,) + row) for position, row in enumerate(self.cursor.fetchall()))
+        results.sort(key=lambda result: (result[0], result[1][4]))
+        return [result for _, result in results[:limit]]
+
+    def insert_telemetry(self, readings):
+        # readings: (machine_id, ts in ms, value) tuples. The batch is staged in a temp table so
+        # the rollup tiers are updated from exactly the rows that are new; the first reading
+        # for a (machine_id, ts) is kept and later duplicates are ignored.
+        self.cursor.execute('''
+        CREATE TEMP TABLE IF NOT EXISTS telemetry_batch (
+            machine_id INTEGER NOT NULL,
+            ts INTEGER NOT NULL,
+            value REAL NOT NULL,
+            PRIMARY KEY (machine_id, ts)
+        ) WITHOUT ROWID
+        ''')
+        with self.transaction():
+            self.cursor.execute("DELETE FROM telemetry_batch")
+            self.cursor.executemany("INSERT OR IGNORE INTO telemetry_batch (machine_id, ts, value) VALUES (?, ?, ?)",
+                                    readings)
+            self.cursor.execute('''
+            DELETE FROM telemetry_batch
+            WHERE EXISTS (SELECT 1 FROM telemetry
+                          WHERE telemetry.machine_id = telemetry_batch.machine_id AND telemetry.ts = telemetry_batch.ts)
+            ''')
+            self.cursor.execute("INSERT INTO telemetry (machine_id, ts, value) SELECT * FROM telemetry_batch")
+            inserted = self.cursor.rowcount
+            for table, width in TELEMETRY_ROLLUPS:
+                self.cursor.execute(f'''
+                INSERT INTO {table} (machine_id, bucket, min, max, sum, count)
+                SELECT machine_id, ts - ts % {width}, MIN(value), MAX(value), SUM(value), COUNT(*)
+                FROM telemetry_batch
+                WHERE true
+                GROUP BY machine_id, ts - ts % {width}
+                ON CONFLICT (machine_id, bucket) DO UPDATE SET
+                    min = min({table}.min, excluded.min),
+                    max = max({table}.max, excluded.max),
+                    sum = {table}.sum + excluded.sum,
+                    count = {table}.count + excluded.count
+                ''')
+        return inserted
 
-    def get_inventory(self):
-        self.cursor.execute('SELECT * FROM inventory')
+    def get_telemetry(self, machine_id, start_ts, end_ts, *, limit=-1):
+        # (ts, value) readings with start_ts <= ts < end_ts, oldest first
+        self.cursor.execute('''
+        SELECT ts, value FROM telemetry
+        WHERE machine_id = ? AND ts >= ? AND ts < ?
+        ORDER BY ts
+        LIMIT ?
+        ''', (machine_id, start_ts, end_ts, limit))
+        return self.cursor.fetchall()
+
+    def get_telemetry_series(self, machine_id, start_ts, end_ts, points):
+        # Downsamples [start_ts, end_ts) to at most points (ts, min, max, avg, count) buckets.
+        # Reads the coarsest rollup tier that still has a bucket per point, so the rows read
+        # stay proportional to points (at most 60x) whatever the range; ranges too short for
+        # the 1-minute tier are grouped from the raw readings.
+        span = max(end_ts - start_ts, 1)
+        points = max(points, 1)
+        for table, width in TELEMETRY_ROLLUPS:
+            if width <= span / points:
+                self.cursor.execute(f'''
+                SELECT MIN(bucket), MIN(min), MAX(max), SUM(sum) / SUM(count), SUM(count)
+                FROM {table}
+                WHERE machine_id = ? AND bucket >= ? AND bucket < ?
+                GROUP BY (bucket - ?) * ? / ?
+                ORDER BY 1
+                ''', (machine_id, start_ts, end_ts, start_ts, points, span))
+                return self.cursor.fetchall()
+        self.cursor.execute('''
+        SELECT MIN(ts), MIN(value), MAX(value), AVG(value), COUNT(*)
+        FROM telemetry
+        WHERE machine_id = ? AND ts >= ? AND ts < ?
+        GROUP BY (ts - ?) * ? / ?
+        ORDER BY 1
+        ''', (machine_id, start_ts, end_ts, start_ts, points, span))
         return self.cursor.fetchall()
 
+    def get_latest_telemetry(self, machine_id, limit=500):
+        # The newest limit (ts, value) readings, oldest first
+        self.cursor.execute('''
+        SELECT * FROM (SELECT ts, value FROM telemetry WHERE machine_id = ? ORDER BY ts DESC LIMIT ?)
+        ORDER BY ts
+        ''', (machine_id, limit))
+        return self.cursor.fetchall()
+
+    def get_telemetry_machines(self, limit=200):
+        # (machine id, name) of machines with readings. The recursive query skips from one
+        # machine_id to the next through the primary key instead of reading every row.
+        self.cursor.execute('''
+        WITH RECURSIVE ids (machine_id) AS (
+            SELECT MIN(machine_id) FROM telemetry
+            UNION ALL
+            SELECT (SELECT MIN(machine_id) FROM telemetry WHERE machine_id > ids.machine_id)
+            FROM ids WHERE ids.machine_id IS NOT NULL
+        )
+        SELECT ids.machine_id, COALESCE(machines.name, 'Machine ' || ids.machine_id)
+        FROM ids
+        LEFT JOIN machines ON machines.id = ids.machine_id
+        WHERE ids.machine_id IS NOT NULL
+        LIMIT ?
+        ''', (limit,))
+        return self.cursor.fetchall()
+
+    def get_export_state(self, name):
+        self.cursor.execute("SELECT last_rowid FROM export_state WHERE name = ?", (name,))
+        row = self.cursor.fetchone()
+        return row[0] if row else 0
+
+    def set_export_state(self, name, last_rowid):
+        self.cursor.execute('''
+        INSERT OR REPLACE INTO export_state (name, last_rowid, exported_at) VALUES (?, ?, ?)
+        ''', (name, last_rowid, datetime.now().strftime('%Y-%m-%d %H:%M:%S')))
+        self.commit()
+
+    def executemany_chunked(self, query, rows, chunk_size=10000):
+        # Runs executemany over an iterable in chunks of chunk_size, all in a single
+        # transaction, so only one chunk is held in memory and there is a single commit.
+        rows = iter(rows)
+        count = 0
+        with self.transaction():
+            while True:
+                chunk = list(islice(rows, chunk_size))
+                if not chunk:
+                    break
+                self.cursor.executemany(query, chunk)
+                count += len(chunk)
+        return count
+
+    def bulk_insert_machines(self, machines, chunk_size=10000):
+        # machines: (name, type, location, installation_date, maintenance_frequency) tuples
+        return self.executemany_chunked('''
+        INSERT INTO machines (name, type, location, installation_date, maintenance_frequency, status)
+        VALUES (?, ?, ?, ?, ?, 'Healthy')
+        ''', machines, chunk_size)
+
+    def bulk_insert_inventory_items(self, items, chunk_size=10000):
+        # items: (item_name, quantity, unit, reorder_level) tuples
+        return self.executemany_chunked('''
+        INSERT INTO inventory (item_name, quantity, unit, reorder_level)
+        VALUES (?, ?, ?, ?)
+        ''', items, chunk_size)
+
+    def bulk_insert_inspections(self, inspections, chunk_size=10000):
+        # inspections: (machine_id, inspection_date, inspector, result, notes) tuples
+        return self.executemany_chunked('''
+        INSERT INTO inspections (machine_id, inspection_date, inspector, result, notes)
+        VALUES (?, ?, ?, ?, ?)
+        ''', inspections, chunk_size)
+
     def close(self):
         self.conn.close()
 
@@ -0,0 +1,80 @@
+from PyQt5.QtCore import QObject, QThread, pyqtSignal, pyqtSlot
+
+from database import Database
+
+class DatabaseWorker(QObject):
+    finished = pyqtSignal(int, object)
+    failed = pyqtSignal(int, str)
+
+    def __init__(self, db_name, db_options):
+        super().__init__()
+        self.db_name = db_name
+        self.db_options = db_options
+        self.db = None
+
+    @pyqtSlot(int, str, object, object)
+    def run(self, request_id, method, args, kwargs):
+        # The connection is opened lazily so it belongs to the worker thread
+        if self.db is None:
+            self.db = Database(self.db_name, **self.db_options)
+        try:
+            result = getattr(self.db, method)(*args, **kwargs)
+        except Exception as e:
+            self.failed.emit(request_id, str(e))
+            return
+        self.finished.emit(request_id, result)
+
+    @pyqtSlot()
+    def close(self):
+        if self.db is not None:
+            self.db.close()
+            self.db = None
+
+class AsyncDatabase(QObject):
+    # Runs Database methods on a background thread with its own sqlite3 connection.
+    # async_db.get_machines(limit=100, callback=fn) queues the call and returns at once;
+    # fn(result) is then invoked on the GUI thread when the query completes.
+    request = pyqtSignal(int, str, object, object)
+    shutdown = pyqtSignal()
+
+    def __init__(self, db_name='dashboard.db', **db_options):
+        super().__init__()
+        self.callbacks = {}
+        self.next_request_id = 0
+
+        self.worker_thread = QThread()
+        self.worker = DatabaseWorker(db_name, db_options)
+        self.worker.moveToThread(self.worker_thread)
+        self.request.connect(self.worker.run)
+        self.shutdown.connect(self.worker.close)
+        self.worker.finished.connect(self.on_finished)
+        self.worker.failed.connect(self.on_failed)
+        self.worker_thread.start()
+
+    def submit(self, method, *args, callback=None, error_callback=None, **kwargs):
+        self.next_request_id += 1
+        self.callbacks[self.next_request_id] = (callback, error_callback)
+        self.request.emit(self.next_request_id, method, args, kwargs)
+        return self.next_request_id
+
+    def __getattr__(self, method):
+        if method.startswith('__') or not hasattr(Database, method):
+            raise AttributeError(method)
+        return lambda *args, **kwargs: self.submit(method, *args, **kwargs)
+
+    def on_finished(self, request_id, result):
+        callback, _ = self.callbacks.pop(request_id, (None, None))
+        if callback:
+            callback(result)
+
+    def on_failed(self, request_id, message):
+        _, error_callback = self.callbacks.pop(request_id, (None, None))
+        if error_callback:
+            error_callback(message)
+        else:
+            print(f"Database request failed: {message}")
+
+    def close(self):
+        self.shutdown.emit()
+        self.worker_thread.quit()
+        self.worker_thread.wait()
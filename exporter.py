@@ -0,0 +1,205 @@
+import argparse
+import csv
+import json
+import sqlite3
+import struct
+import sys
+import time
+from array import array
+
+from database import Database
+
+# Named joins; the first selected column is the key used for ordering and incremental exports
+JOINS = {
+    'machines_maintenance': '''
+        SELECT maintenance_history.id, maintenance_history.id AS maintenance_id, machines.id AS machine_id,
+               machines.name, machines.type, machines.location, maintenance_history.maintenance_date,
+               maintenance_history.description
+        FROM maintenance_history
+        JOIN machines ON machines.id = maintenance_history.machine_id
+        WHERE maintenance_history.id > ?
+        ORDER BY maintenance_history.id
+    ''',
+    'inspections_machines': '''
+        SELECT inspections.id, inspections.id AS inspection_id, machines.id AS machine_id, machines.name,
+               inspections.inspection_date, inspections.inspector, inspections.result, inspections.notes
+        FROM inspections
+        JOIN machines ON machines.id = inspections.machine_id
+        WHERE inspections.id > ?
+        ORDER BY inspections.id
+    ''',
+}
+
+COLUMNAR_MAGIC = b'MDCOL1\n'
+
+def primary_key(db, source):
+    db.cursor.execute("SELECT name FROM pragma_table_info(?) WHERE pk > 0 ORDER BY pk", (source,))
+    return [row[0] for row in db.cursor.fetchall()]
+
+def source_query(db, source, incremental=False):
+    if source in JOINS:
+        return JOINS[source]
+    db.cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (source,))
+    if not db.cursor.fetchone():
+        raise ValueError(f"Unknown table or join: {source}")
+    try:
+        db.cursor.execute(f'SELECT rowid FROM "{source}" LIMIT 0')
+    except sqlite3.OperationalError:
+        # WITHOUT ROWID tables (telemetry and its rollups) have a composite key, so they are
+        # exported whole in key order; there is no single key to resume an incremental run from
+        if incremental:
+            raise ValueError(f"{source} has no rowid and cannot be exported incrementally")
+        key = ', '.join(f'"{column}"' for column in primary_key(db, source))
+        return f'SELECT NULL, * FROM "{source}" WHERE ? IS NOT NULL ORDER BY {key}'
+    return f'SELECT rowid, * FROM "{source}" WHERE rowid > ? ORDER BY rowid'
+
+def stream_rows(db, source, after_rowid=0, batch_size=5000, incremental=False):
+    # Returns (column names, generator of row batches). Rows are pulled with fetchmany on a
+    # dedicated cursor, so memory stays at one batch; each row still starts with its key.
+    cursor = db.conn.cursor()
+    cursor.execute(source_query(db, source, incremental), (after_rowid,))
+    columns = [description[0] for description in cursor.description][1:]
+
+    def batches():
+        try:
+            while True:
+                batch = cursor.fetchmany(batch_size)
+                if not batch:
+                    break
+                yield batch
+        finally:
+            cursor.close()
+
+    return columns, batches()
+
+def write_csv(f, columns, batches):
+    writer = csv.writer(f)
+    writer.writerow(columns)
+    count, last_key = 0, None
+    for batch in batches:
+        writer.writerows(row[1:] for row in batch)
+        count += len(batch)
+        last_key = batch[-1][0]
+    return count, last_key
+
+def write_jsonl(f, columns, batches):
+    count, last_key = 0, None
+    for batch in batches:
+        for row in batch:
+            f.write(json.dumps(dict(zip(columns, row[1:]))) + '\n')
+        count += len(batch)
+        last_key = batch[-1][0]
+    return count, last_key
+
+def encode_column(values):
+    # One column of a row group: a type tag, a null bitmap and the packed values.
+    # Columns mixing types (SQLite allows it) are stored as text.
+    present = [value for value in values if value is not None]
+    nulls = bytearray((len(values) + 7) // 8)
+    for i, value in enumerate(values):
+        if value is None:
+            nulls[i // 8] |= 1 << (i % 8)
+    if present and all(type(value) is int for value in present):
+        tag, payload = b'i', array('q', (0 if value is None else value for value in values)).tobytes()
+    elif present and all(type(value) in (int, float) for value in present):
+        tag, payload = b'f', array('d', (0.0 if value is None else value for value in values)).tobytes()
+    elif present and all(type(value) is bytes for value in present):
+        tag = b'b'
+        lengths = array('I', (0 if value is None else len(value) for value in values))
+        payload = lengths.tobytes() + b''.join(present)
+    else:
+        tag = b't'
+        encoded = [b'' if value is None else str(value).encode() for value in values]
+        payload = array('I', (len(value) for value in encoded)).tobytes() + b''.join(encoded)
+    return tag + struct.pack('<II', len(nulls), len(payload)) + bytes(nulls) + payload
+
+def write_columnar(f, columns, batches):
+    # Layout: magic, header length + JSON header, then row groups of
+    # (row count, one encoded chunk per column), terminated by a zero row count.
+    header = json.dumps({'columns': columns}).encode()
+    f.write(COLUMNAR_MAGIC + struct.pack('<I', len(header)) + header)
+    count, last_key = 0, None
+    for batch in batches:
+        f.write(struct.pack('<I', len(batch)))
+        for index in range(1, len(columns) + 1):
+            f.write(encode_column([row[index] for row in batch]))
+        count += len(batch)
+        last_key = batch[-1][0]
+    f.write(struct.pack('<I', 0))
+    return count, last_key
+
+def decode_column(tag, rows, nulls, payload):
+    if tag == b'i':
+        values = array('q')
+        values.frombytes(payload)
+    elif tag == b'f':
+        values = array('d')
+        values.frombytes(payload)
+    else:
+        lengths = array('I')
+        lengths.frombytes(payload[:4 * rows])
+        values, offset = [], 4 * rows
+        for length in lengths:
+            chunk = payload[offset:offset + length]
+            values.append(chunk.decode() if tag == b't' else chunk)
+            offset += length
+    return [None if nulls[i // 8] & (1 << (i % 8)) else values[i] for i in range(rows)]
+
+def read_columnar(f):
+    # Yields (columns, rows) for each row group of a file written by write_columnar
+    if f.read(len(COLUMNAR_MAGIC)) != COLUMNAR_MAGIC:
+        raise ValueError("Not a columnar export file")
+    header_length, = struct.unpack('<I', f.read(4))
+    columns = json.loads(f.read(header_length))['columns']
+    while True:
+        rows, = struct.unpack('<I', f.read(4))
+        if rows == 0:
+            break
+        decoded = []
+        for _ in columns:
+            tag = f.read(1)
+            nulls_length, payload_length = struct.unpack('<II', f.read(8))
+            nulls = f.read(nulls_length)
+            decoded.append(decode_column(tag, rows, nulls, f.read(payload_length)))
+        yield columns, list(zip(*decoded))
+
+WRITERS = {
+    'csv': (write_csv, 'w'),
+    'jsonl': (write_jsonl, 'w'),
+    'columnar': (write_columnar, 'wb'),
+}
+
+def export(db, source, path, file_format, incremental=False, state_name=None, batch_size=5000):
+    state_name = state_name or f"{source}:{file_format}"
+    after_rowid = db.get_export_state(state_name) if incremental else 0
+    columns, batches = stream_rows(db, source, after_rowid, batch_size, incremental)
+    writer, mode = WRITERS[file_format]
+    with open(path, mode, **({'newline': ''} if mode == 'w' else {})) as f:
+        count, last_key = writer(f, columns, batches)
+    if incremental and last_key is not None:
+        db.set_export_state(state_name, last_key)
+    return count
+
+def main():
+    parser = argparse.ArgumentParser(description="Stream a table or join out of the maintenance database")
+    parser.add_argument('source', help=f"table name or one of: {', '.join(JOINS)}")
+    parser.add_argument('path')
+    parser.add_argument('--format', choices=sorted(WRITERS), default='csv')
+    parser.add_argument('--db', default='dashboard.db')
+    parser.add_argument('--incremental', action='store_true', help="only export rows added since the last run")
+    parser.add_argument('--state-name', help="incremental state key, defaults to SOURCE:FORMAT")
+    parser.add_argument('--batch-size', type=int, default=5000)
+    args = parser.parse_args()
+
+    db = Database(args.db)
+    started = time.perf_counter()
+    try:
+        count = export(db, args.source, args.path, args.format, args.incremental, args.state_name, args.batch_size)
+    except (ValueError, sqlite3.Error) as e:
+        sys.exit(str(e))
+    finally:
+        db.close()
+    print(f"Exported {count} rows to {args.path} in {time.perf_counter() - started:.1f} s")
+
+if __name__ == '__main__':
+    main()
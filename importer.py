@@ -0,0 +1,83 @@
+import argparse
+import csv
+import json
+import sqlite3
+import sys
+import time
+
+from database import Database
+
+# Table -> (Database bulk method, fields in insert order, field converters, optional fields)
+IMPORTS = {
+    'machines': ('bulk_insert_machines',
+                 ['name', 'type', 'location', 'installation_date', 'maintenance_frequency'],
+                 {'maintenance_frequency': int}, set()),
+    'inventory': ('bulk_insert_inventory_items',
+                  ['item_name', 'quantity', 'unit', 'reorder_level'],
+                  {'quantity': int, 'reorder_level': int}, set()),
+    'inspections': ('bulk_insert_inspections',
+                    ['machine_id', 'inspection_date', 'inspector', 'result', 'notes'],
+                    {'machine_id': int}, {'machine_id', 'notes'}),
+}
+
+def read_records(f, file_format):
+    if file_format == 'csv':
+        yield from csv.DictReader(f)
+    else:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+def to_rows(records, fields, converters, optional=()):
+    for line_number, record in enumerate(records, 1):
+        # CSV leaves missing cells as '' and JSONL as null or an absent key
+        missing = [field for field in fields if field not in optional and record.get(field) in (None, '')]
+        if missing:
+            raise ValueError(f"Record {line_number}: missing field {', '.join(missing)}")
+        try:
+            yield tuple(converters.get(field, str)(record[field]) if record.get(field) not in (None, '') else None
+                        for field in fields)
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"Record {line_number}: {e}") from e
+
+def report_progress(rows, every):
+    started = time.perf_counter()
+    count = 0
+    for row in rows:
+        count += 1
+        if count % every == 0:
+            elapsed = time.perf_counter() - started
+            print(f"{count} rows, {count / elapsed:.0f} rows/s", file=sys.stderr)
+        yield row
+
+def main():
+    parser = argparse.ArgumentParser(description="Stream CSV or JSONL records into the maintenance database")
+    parser.add_argument('table', choices=sorted(IMPORTS))
+    parser.add_argument('path', help="input file, or - for stdin")
+    parser.add_argument('--format', choices=['csv', 'jsonl'], help="defaults to the file extension")
+    parser.add_argument('--db', default='dashboard.db')
+    parser.add_argument('--chunk-size', type=int, default=10000)
+    parser.add_argument('--progress-every', type=int, default=100000)
+    args = parser.parse_args()
+
+    file_format = args.format or ('jsonl' if args.path.endswith(('.jsonl', '.json')) else 'csv')
+    method, fields, converters, optional = IMPORTS[args.table]
+    db = Database(args.db)
+    f = sys.stdin if args.path == '-' else open(args.path, newline='')
+    started = time.perf_counter()
+    try:
+        rows = report_progress(to_rows(read_records(f, file_format), fields, converters, optional),
+                               args.progress_every)
+        count = getattr(db, method)(rows, chunk_size=args.chunk_size)
+    except (ValueError, sqlite3.IntegrityError) as e:
+        # The import runs in one transaction, so nothing was written
+        sys.exit(f"Import failed, no rows imported: {e}")
+    finally:
+        if f is not sys.stdin:
+            f.close()
+        db.close()
+    elapsed = time.perf_counter() - started
+    print(f"Imported {count} {args.table} rows in {elapsed:.1f} s ({count / max(elapsed, 1e-9):.0f} rows/s)")
+
+if __name__ == '__main__':
+    main()
@@ -1,4 +1,6 @@
-from PyQt5.QtWidgets import QWidget, QVBoxLayout, QTableWidget, QTableWidgetItem, QPushButton, QDialog, QFormLayout, QLineEdit, QDateEdit, QTextEdit, QComboBox
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QPushButton, QDialog, QFormLayout, QLineEdit, QDateEdit, QTextEdit, QComboBox
+
+from table_model import LazyTableModel, create_table_view, set_action_column
 
 class InspectionsPage(QWidget):
     def __init__(self, main_window):
@@ -6,9 +8,12 @@ class InspectionsPage(QWidget):
         self.main_window = main_window
         layout = QVBoxLayout(self)
 
-        self.table = QTableWidget()
-        self.table.setColumnCount(6)
-        self.table.setHorizontalHeaderLabels(["Machine", "Date", "Inspector", "Result", "Notes", "Actions"])
+        self.model = LazyTableModel(
+            ["Machine", "Date", "Inspector", "Result", "Notes", "Actions"],
+            [6, 2, 3, 4, 5],
+            self.main_window.async_db.get_inspections_with_machine, asynchronous=True)
+        self.table = create_table_view(self.model)
+        set_action_column(self.table, 5, [("View", self.view_inspection)])
 
         add_inspection_button = QPushButton("Add Inspection")
         add_inspection_button.clicked.connect(self.show_add_inspection_dialog)
@@ -19,22 +24,7 @@ class InspectionsPage(QWidget):
         self.update_table()
 
     def update_table(self):
-        self.table.setRowCount(0)
-        inspections = self.main_window.db.get_inspections()
-        for inspection in inspections:
-            row_position = self.table.rowCount()
-            self.table.insertRow(row_position)
-            
-            machine = self.main_window.db.get_machines(inspection[1])[0]
-            self.table.setItem(row_position, 0, QTableWidgetItem(machine[1]))
-            self.table.setItem(row_position, 1, QTableWidgetItem(inspection[2]))
-            self.table.setItem(row_position, 2, QTableWidgetItem(inspection[3]))
-            self.table.setItem(row_position, 3, QTableWidgetItem(inspection[4]))
-            self.table.setItem(row_position, 4, QTableWidgetItem(inspection[5]))
-
-            view_button = QPushButton("View")
-            view_button.clicked.connect(lambda _, i=inspection: self.view_inspection(i))
-            self.table.setCellWidget(row_position, 5, view_button)
+        self.model.refresh()
 
     def show_add_inspection_dialog(self):
         dialog = AddInspectionDialog(self.main_window)
@@ -53,9 +43,7 @@ class AddInspectionDialog(QDialog):
         layout = QFormLayout(self)
 
         self.machine_input = QComboBox()
-        machines = self.main_window.db.get_machines()
-        for machine in machines:
-            self.machine_input.addItem(machine[1], machine[0])
+        self.main_window.async_db.get_machines(callback=self.set_machines)
 
         self.date_input = QDateEdit()
         self.inspector_input = QLineEdit()
@@ -73,6 +61,10 @@ class AddInspectionDialog(QDialog):
         layout.addRow("Notes:", self.notes_input)
         layout.addRow(submit_button)
 
+    def set_machines(self, machines):
+        for machine in machines:
+            self.machine_input.addItem(machine[1], machine[0])
+
     def add_inspection(self):
         machine_id = self.machine_input.currentData()
         date = self.date_input.date().toString("yyyy-MM-dd")
@@ -90,8 +82,8 @@ class ViewInspectionDialog(QDialog):
         self.setWindowTitle("View Inspection")
         layout = QFormLayout(self)
 
-        machine = self.main_window.db.get_machines(inspection[1])[0]
-        layout.addRow("Machine:", QLineEdit(machine[1]))
+        machine = self.main_window.db.get_machine(inspection[1])
+        layout.addRow("Machine:", QLineEdit(machine[1] if machine else ""))
         layout.addRow("Date:", QLineEdit(inspection[2]))
         layout.addRow("Inspector:", QLineEdit(inspection[3]))
         layout.addRow("Result:", QLineEdit(inspection[4]))
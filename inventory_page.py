@@ -1,4 +1,9 @@
-from PyQt5.QtWidgets import QWidget, QVBoxLayout, QTableWidget, QTableWidgetItem, QPushButton, QDialog, QFormLayout, QLineEdit, QSpinBox
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QDialog, QFormLayout, QLineEdit, QSpinBox
+from PyQt5.QtGui import QColor
+
+from table_model import LazyTableModel, create_table_view, set_action_column
+
+LOW_STOCK_COLOR = QColor("#FFCDD2")
 
 class InventoryPage(QWidget):
     def __init__(self, main_window):
@@ -6,33 +11,40 @@ class InventoryPage(QWidget):
         self.main_window = main_window
         layout = QVBoxLayout(self)
 
-        self.table = QTableWidget()
-        self.table.setColumnCount(5)
-        self.table.setHorizontalHeaderLabels(["Item Name", "Quantity", "Unit", "Reorder Level", "Actions"])
+        self.model = LazyTableModel(
+            ["Item Name", "Quantity", "Unit", "Reorder Level", "Actions"],
+            [1, 2, 3, 4],
+            self.main_window.async_db.get_inventory, asynchronous=True,
+            highlight=lambda item: LOW_STOCK_COLOR if item[2] <= item[4] else None)
+        self.table = create_table_view(self.model)
+        set_action_column(self.table, 4, [("Edit", self.edit_item)])
+
+        self.low_stock_button = QPushButton("Low Stock Only")
+        self.low_stock_button.setCheckable(True)
+        self.low_stock_button.toggled.connect(self.toggle_low_stock)
 
         add_item_button = QPushButton("Add Inventory Item")
         add_item_button.clicked.connect(self.show_add_item_dialog)
 
+        buttons_layout = QHBoxLayout()
+        buttons_layout.addWidget(self.low_stock_button)
+        buttons_layout.addWidget(add_item_button)
+
         layout.addWidget(self.table)
-        layout.addWidget(add_item_button)
+        layout.addLayout(buttons_layout)
 
         self.update_table()
 
     def update_table(self):
-        self.table.setRowCount(0)
-        inventory_items = self.main_window.db.get_inventory()
-        for item in inventory_items:
-            row_position = self.table.rowCount()
-            self.table.insertRow(row_position)
-            
-            self.table.setItem(row_position, 0, QTableWidgetItem(item[1]))
-            self.table.setItem(row_position, 1, QTableWidgetItem(str(item[2])))
-            self.table.setItem(row_position, 2, QTableWidgetItem(item[3]))
-            self.table.setItem(row_position, 3, QTableWidgetItem(str(item[4])))
-
-            edit_button = QPushButton("Edit")
-            edit_button.clicked.connect(lambda _, i=item: self.edit_item(i))
-            self.table.setCellWidget(row_position, 4, edit_button)
+        self.model.refresh()
+        self.main_window.async_db.get_low_stock_count(callback=self.show_low_stock_count)
+
+    def show_low_stock_count(self, count):
+        self.low_stock_button.setText(f"Low Stock Only ({count})")
+
+    def toggle_low_stock(self, checked):
+        async_db = self.main_window.async_db
+        self.model.set_fetch_page(async_db.get_low_stock_items if checked else async_db.get_inventory)
 
     def show_add_item_dialog(self):
         dialog = AddInventoryItemDialog(self.main_window)
@@ -108,10 +120,4 @@ class EditInventoryItemDialog(QDialog):
         unit = self.unit_input.text()
         reorder_level = self.reorder_level_input.value()
 
-        self.main_window.db.cursor.execute('''
-        UPDATE inventory 
-        SET item_name = ?, quantity = ?, unit = ?, reorder_level = ?
-        WHERE id = ?
-        ''', (name, quantity, unit, reorder_level, self.item[0]))
-        self.main_window.db.conn.commit()
-        self.accept()
\ No newline at end of file
+        self.main_window.submit_write(self, 'update_inventory_item', self.item[0], name, quantity, unit, reorder_level)
\ No newline at end of file
@@ -1,6 +1,8 @@
-from PyQt5.QtWidgets import QWidget, QVBoxLayout, QTableWidget, QTableWidgetItem, QPushButton, QHeaderView, QHBoxLayout, QDialog, QFormLayout, QLineEdit, QDateEdit, QComboBox, QSpinBox
-from PyQt5.QtCore import QDate
-from datetime import datetime, timedelta
+from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QDialog, QFormLayout, QLineEdit, QDateEdit,
+                             QComboBox, QSpinBox, QListWidget, QListWidgetItem, QCompleter)
+from PyQt5.QtCore import Qt, QTimer, QDate
+
+from table_model import LazyTableModel, create_table_view, set_action_column
 
 class MachinesPage(QWidget):
     def __init__(self, main_window):
@@ -8,10 +10,12 @@ class MachinesPage(QWidget):
         self.main_window = main_window
         layout = QVBoxLayout(self)
         
-        self.table = QTableWidget()
-        self.table.setColumnCount(6)
-        self.table.setHorizontalHeaderLabels(["Name", "Type", "Status", "Next Maintenance", "Location", "Actions"])
-        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.model = LazyTableModel(
+            ["Name", "Type", "Status", "Next Maintenance", "Location", "Actions"],
+            [1, 2, 7, 8, 3],
+            self.main_window.async_db.get_machines, asynchronous=True)
+        self.table = create_table_view(self.model, stretch=True)
+        set_action_column(self.table, 5, [("Edit", self.edit_machine), ("Log Maintenance", self.log_maintenance)])
         
         add_button = QPushButton("Add Machine")
         add_button.clicked.connect(self.show_add_machine_form)
@@ -22,40 +26,7 @@ class MachinesPage(QWidget):
         self.update_table()
 
     def update_table(self):
-        self.table.setRowCount(0)
-        machines = self.main_window.db.get_machines()
-        
-        for machine in machines:
-            row_position = self.table.rowCount()
-            self.table.insertRow(row_position)
-            
-            self.table.setItem(row_position, 0, QTableWidgetItem(machine[1]))
-            self.table.setItem(row_position, 1, QTableWidgetItem(machine[2]))
-            self.table.setItem(row_position, 2, QTableWidgetItem(machine[7]))
-            
-            next_maintenance = self.calculate_next_maintenance(machine[4], machine[5], machine[6])
-            self.table.setItem(row_position, 3, QTableWidgetItem(next_maintenance))
-            
-            self.table.setItem(row_position, 4, QTableWidgetItem(machine[3]))
-            
-            actions_widget = QWidget()
-            actions_layout = QHBoxLayout(actions_widget)
-            edit_button = QPushButton("Edit")
-            edit_button.clicked.connect(lambda _, m=machine: self.edit_machine(m))
-            actions_layout.addWidget(edit_button)
-            maintenance_button = QPushButton("Log Maintenance")
-            maintenance_button.clicked.connect(lambda _, m=machine: self.log_maintenance(m))
-            actions_layout.addWidget(maintenance_button)
-            self.table.setCellWidget(row_position, 5, actions_widget)
-
-    def calculate_next_maintenance(self, installation_date, frequency, last_maintenance):
-        if last_maintenance:
-            last_date = datetime.strptime(last_maintenance, '%Y-%m-%d')
-        else:
-            last_date = datetime.strptime(installation_date, '%Y-%m-%d')
-        
-        next_date = last_date + timedelta(days=frequency)
-        return next_date.strftime('%Y-%m-%d')
+        self.model.refresh()
 
     def show_add_machine_form(self):
         form = AddMachineForm(self.main_window)
@@ -168,37 +139,101 @@ class EditMachineForm(QDialog):
             self.main_window.show_error("Invalid Input", "All fields are required.")
             return
         
-        self.main_window.db.cursor.execute('''
-        UPDATE machines 
-        SET name = ?, type = ?, location = ?, installation_date = ?, maintenance_frequency = ?, status = ?
-        WHERE id = ?
-        ''', (name, machine_type, location, installation_date, maintenance_frequency, status, self.machine[0]))
-        self.main_window.db.conn.commit()
-        self.accept()
+        self.main_window.submit_write(self, 'update_machine', self.machine[0], name, machine_type, location,
+                                      installation_date, maintenance_frequency, status)
 
 class LogMaintenanceForm(QDialog):
+    PART_LOOKUP_LIMIT = 50
+
     def __init__(self, main_window, machine):
         super().__init__()
         self.main_window = main_window
         self.machine = machine
         self.setWindowTitle("Log Maintenance")
-        self.setGeometry(200, 200, 400, 200)
+        self.setGeometry(200, 200, 400, 360)
         
         layout = QFormLayout(self)
         
         self.description_input = QLineEdit()
         layout.addRow("Description:", self.description_input)
+
+        # Parts picker: choose an inventory item and quantity, then add it to the list. The
+        # choices are the first PART_LOOKUP_LIMIT items matching the typed name prefix,
+        # looked up once typing pauses, so the inventory is never loaded whole.
+        self.part_input = QComboBox()
+        self.part_input.setEditable(True)
+        self.part_input.setInsertPolicy(QComboBox.NoInsert)
+        self.part_input.completer().setCompletionMode(QCompleter.PopupCompletion)
+        self.part_lookup_timer = QTimer(self)
+        self.part_lookup_timer.setSingleShot(True)
+        self.part_lookup_timer.setInterval(self.main_window.SEARCH_DELAY_MS)
+        self.part_lookup_timer.timeout.connect(self.lookup_parts)
+        self.part_input.lineEdit().textEdited.connect(self.part_lookup_timer.start)
+        self.part_quantity_input = QSpinBox()
+        self.part_quantity_input.setRange(1, 1000000)
+        add_part_button = QPushButton("Add Part")
+        add_part_button.clicked.connect(self.add_part)
+        part_layout = QHBoxLayout()
+        part_layout.addWidget(self.part_input, 1)
+        part_layout.addWidget(self.part_quantity_input)
+        part_layout.addWidget(add_part_button)
+        layout.addRow("Part:", part_layout)
+
+        self.parts_list = QListWidget()
+        remove_part_button = QPushButton("Remove Part")
+        remove_part_button.clicked.connect(self.remove_part)
+        layout.addRow("Parts Used:", self.parts_list)
+        layout.addRow(remove_part_button)
         
         submit_button = QPushButton("Log Maintenance")
         submit_button.clicked.connect(self.log_maintenance)
         layout.addRow(submit_button)
 
+        self.lookup_parts()
+
+    def lookup_parts(self):
+        prefix = self.part_input.currentText()
+        self.main_window.async_db.search_inventory(prefix, self.PART_LOOKUP_LIMIT,
+                                                   callback=lambda items: self.set_items(prefix, items))
+
+    def set_items(self, prefix, items):
+        text = self.part_input.currentText()
+        if prefix != text:
+            return  # the text changed while this lookup was running
+        cursor = self.part_input.lineEdit().cursorPosition()
+        self.part_input.clear()
+        for item in items:
+            self.part_input.addItem(f"{item[1]} ({item[2]} {item[3]})", item[0])
+        self.part_input.setCurrentIndex(-1)
+        self.part_input.setEditText(text)
+        self.part_input.lineEdit().setCursorPosition(cursor)
+        if text and items and self.part_input.hasFocus():
+            self.part_input.completer().complete()
+
+    def add_part(self):
+        index = self.part_input.findText(self.part_input.currentText())
+        if index < 0:
+            self.main_window.show_error("Invalid Input", "Choose a part from the inventory.")
+            return
+        item_id = self.part_input.itemData(index)
+        quantity = self.part_quantity_input.value()
+        name = self.part_input.itemText(index).rsplit(" (", 1)[0]
+        part = QListWidgetItem(f"{name} x {quantity}")
+        part.setData(Qt.UserRole, (item_id, quantity))
+        self.parts_list.addItem(part)
+
+    def remove_part(self):
+        for part in self.parts_list.selectedItems():
+            self.parts_list.takeItem(self.parts_list.row(part))
+
     def log_maintenance(self):
         description = self.description_input.text()
         
         if not description:
             self.main_window.show_error("Invalid Input", "Description is required.")
             return
-        
-        self.main_window.db.add_maintenance(self.machine[0], description)
-        self.accept()
\ No newline at end of file
+
+        parts = [self.parts_list.item(i).data(Qt.UserRole) for i in range(self.parts_list.count())]
+        # A stock shortfall fails the write with a message naming the short items
+        self.main_window.submit_write(self, 'log_maintenance_with_parts', self.machine[0], description, parts,
+                                      error_title="Maintenance Not Logged")
\ No newline at end of file
@@ -1,9 +1,51 @@
+import time
+
+STARTED = time.perf_counter()
+
+import argparse
 import sys
-from PyQt5.QtWidgets import QApplication
-from main_window import MainWindow
+
+from startup_profile import StartupProfile
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Maintenance dashboard")
+    parser.add_argument('--db', default='dashboard.db', help="SQLite database file")
+    parser.add_argument('--db-profile', default='balanced', help="connection profile: default, balanced or fast")
+    parser.add_argument('--db-config', help="JSON file with a connection profile and PRAGMA overrides")
+    parser.add_argument('--sweep-interval', type=float, default=900,
+                        help="seconds between status sweeps, 0 disables them")
+    parser.add_argument('--profile-startup', nargs='?', const='startup_profile.json', metavar='REPORT',
+                        help="Time each startup phase, write a JSON report and exit (no status sweep)")
+    # Anything else is left for Qt (e.g. -platform offscreen)
+    args, qt_args = parser.parse_known_args()
+    return args, [sys.argv[0]] + qt_args
 
 if __name__ == "__main__":
-    app = QApplication(sys.argv)
-    window = MainWindow()
-    window.show()
-    sys.exit(app.exec_())
\ No newline at end of file
+    args, qt_args = parse_args()
+    profile = StartupProfile(enabled=bool(args.profile_startup), started=STARTED)
+
+    with profile.phase("import:PyQt5"):
+        from PyQt5.QtWidgets import QApplication
+    with profile.phase("import:main_window"):
+        from main_window import MainWindow
+
+    with profile.phase("qapplication"):
+        app = QApplication(qt_args)
+    with profile.phase("main_window"):
+        # The sweep thread would write to the database and compete with the phases being timed
+        window = MainWindow(args.db, profile=profile,
+                            db_options={'profile': args.db_profile, 'config_file': args.db_config},
+                            sweep_interval=None if args.profile_startup else args.sweep_interval)
+    with profile.phase("first_paint"):
+        window.show()
+        app.processEvents()
+
+    if args.profile_startup:
+        for page_name in MainWindow.PAGE_CLASSES:
+            window.get_page(page_name)
+        app.processEvents()
+        profile.write(args.profile_startup)
+        window.close()
+        sys.exit(0)
+
+    sys.exit(app.exec_())
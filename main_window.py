@@ -1,8 +1,10 @@
-from PyQt5.QtWidgets import QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QStackedWidget, QFrame
+from PyQt5.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QStackedWidget,
+                             QFrame, QLineEdit, QListWidget, QListWidgetItem, QAbstractItemView)
 from PyQt5.QtGui import QFont, QIcon, QPalette, QColor, QLinearGradient
-from PyQt5.QtCore import Qt, QSize, QPropertyAnimation, QEasingCurve
+from PyQt5.QtCore import Qt, QSize, QPropertyAnimation, QEasingCurve, QTimer
 
 from database import Database
+from db_worker import AsyncDatabase
 from login_page import LoginPage
 from dashboard_page import DashboardPage
 from machines_page import MachinesPage
@@ -13,14 +15,49 @@ from resources_page import ResourcesPage
 from work_orders_page import WorkOrdersPage
 from inventory_page import InventoryPage
 from notifications import NotificationSystem
+from startup_profile import StartupProfile
+from status_sweep import StatusSweepThread
 
 class MainWindow(QMainWindow):
-    def __init__(self):
+    SEARCH_DELAY_MS = 250
+    # Page that lists each kind of search result
+    SEARCH_RESULT_PAGES = {
+        'work_order': "Work Orders",
+        'inspection': "Inspections",
+        'maintenance': "Machines",
+    }
+
+    # Pages are built the first time they are shown (or prefetched after login)
+    PAGE_CLASSES = {
+        "Dashboard": DashboardPage,
+        "Machines": MachinesPage,
+        "Users": UsersPage,
+        "Calendar": CalendarPage,
+        "Inspections": InspectionsPage,
+        "Resources": ResourcesPage,
+        "Work Orders": WorkOrdersPage,
+        "Inventory": InventoryPage
+    }
+
+    def __init__(self, db_name='dashboard.db', prefetch_pages=True, profile=None, db_options=None, sweep_interval=900):
         
         super().__init__()
-        self.db = Database()
+        self.profile = profile or StartupProfile(enabled=False)
+        db_options = db_options or {}
+        with self.profile.phase("database"):
+            self.db = Database(db_name, **db_options)
+        with self.profile.phase("async_database"):
+            self.async_db = AsyncDatabase(db_name, **db_options)
+        # Keeps machines.status current with the predictions; None disables it
+        self.status_sweep = None
+        if sweep_interval:
+            self.status_sweep = StatusSweepThread(db_name, sweep_interval, db_options=db_options)
+            self.status_sweep.start()
+        self.prefetch_pages = prefetch_pages
+        self.pages = {}
         self.notification_system = NotificationSystem()
-        self.add_test_user()
+        with self.profile.phase("add_test_user"):
+            self.add_test_user()
         self.current_user = None
         self.setWindowTitle("Advanced Dashboard")
         self.setGeometry(100, 100, 1400, 900)
@@ -45,16 +82,38 @@ class MainWindow(QMainWindow):
         self.layout.addWidget(self.sidebar)
         self.layout.addWidget(self.content)
         
-        self.setup_sidebar()
-        self.setup_pages()
+        with self.profile.phase("sidebar"):
+            self.setup_sidebar()
+        with self.profile.phase("login_page"):
+            self.setup_pages()
         
-        self.apply_styles()
+        with self.profile.phase("styles"):
+            self.apply_styles()
 
     def setup_sidebar(self):
         logo = QLabel("Dashboard")
         logo.setObjectName("logo")
         logo.setAlignment(Qt.AlignCenter)
         self.sidebar_layout.addWidget(logo)
+
+        # Global search, queried once typing pauses for SEARCH_DELAY_MS
+        self.search_input = QLineEdit()
+        self.search_input.setObjectName("search-input")
+        self.search_input.setPlaceholderText("Search...")
+        self.search_input.setClearButtonEnabled(True)
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(self.SEARCH_DELAY_MS)
+        self.search_timer.timeout.connect(self.run_search)
+        self.search_input.textChanged.connect(self.search_timer.start)
+        self.sidebar_layout.addWidget(self.search_input)
+
+        self.search_results = QListWidget()
+        self.search_results.setObjectName("search-results")
+        self.search_results.setWordWrap(True)
+        self.search_results.hide()
+        self.search_results.itemClicked.connect(self.open_search_result)
+        self.sidebar_layout.addWidget(self.search_results)
         
         self.sidebar_buttons = []
         buttons = [
@@ -90,57 +149,94 @@ class MainWindow(QMainWindow):
 
     def setup_pages(self):
         self.login_page = LoginPage(self)
-        self.dashboard_page = DashboardPage(self)
-        self.machines_page = MachinesPage(self)
-        self.users_page = UsersPage(self)
-        self.calendar_page = CalendarPage(self)
-        self.inspections_page = InspectionsPage(self)
-        self.resources_page = ResourcesPage(self)
-        self.work_orders_page = WorkOrdersPage(self)
-        self.inventory_page = InventoryPage(self)
-        
         self.content.addWidget(self.login_page)
-        self.content.addWidget(self.dashboard_page)
-        self.content.addWidget(self.machines_page)
-        self.content.addWidget(self.users_page)
-        self.content.addWidget(self.calendar_page)
-        self.content.addWidget(self.inspections_page)
-        self.content.addWidget(self.resources_page)
-        self.content.addWidget(self.work_orders_page)
-        self.content.addWidget(self.inventory_page)
-        
         self.content.setCurrentWidget(self.login_page)
 
+    def get_page(self, page_name):
+        page = self.pages.get(page_name)
+        if page is None:
+            with self.profile.phase(f"page:{page_name}"):
+                page = self.PAGE_CLASSES[page_name](self)
+            self.pages[page_name] = page
+            self.content.addWidget(page)
+        return page
+
+    def prefetch_next_page(self):
+        # Builds one remaining page per event loop pass so the UI stays responsive
+        if not self.current_user:
+            return
+        for page_name in self.PAGE_CLASSES:
+            if page_name in self.pages or (page_name == "Users" and self.current_user[3] != "Super Admin"):
+                continue
+            self.get_page(page_name)
+            QTimer.singleShot(0, self.prefetch_next_page)
+            return
+
+    def closeEvent(self, event):
+        if self.status_sweep:
+            self.status_sweep.stop()
+        self.async_db.close()
+        super().closeEvent(event)
+
     def change_page(self, page_name):
         if not self.current_user:
             return
         
-        page_map = {
-            "Dashboard": self.dashboard_page,
-            "Machines": self.machines_page,
-            "Users": self.users_page,
-            "Calendar": self.calendar_page,
-            "Inspections": self.inspections_page,
-            "Resources": self.resources_page,
-            "Work Orders": self.work_orders_page,
-            "Inventory": self.inventory_page
-        }
-        
-        if page_name in page_map:
+        if page_name in self.PAGE_CLASSES:
             if page_name == "Users" and self.current_user[3] != "Super Admin":
                 self.notification_system.show_warning(self, "Access Denied", "You don't have permission to access this page.")
             else:
-                self.content.setCurrentWidget(page_map[page_name])
+                self.content.setCurrentWidget(self.get_page(page_name))
                 for button in self.sidebar_buttons:
                     button.setChecked(button.text() == page_name)
 
+    def run_search(self):
+        query = self.search_input.text().strip()
+        if not query:
+            self.show_search_results(query, [])
+            return
+        self.async_db.search(query, limit=20, callback=lambda results: self.show_search_results(query, results))
+
+    def show_search_results(self, query, results):
+        if query != self.search_input.text().strip():
+            return  # the text changed while this search was running
+        self.search_results.clear()
+        for kind, _, title, snippet, _, row_id in results:
+            item = QListWidgetItem(f"{title}\n{snippet}")
+            item.setData(Qt.UserRole, (kind, row_id))
+            self.search_results.addItem(item)
+        self.search_results.setVisible(bool(results) or bool(query))
+        if query and not results:
+            self.search_results.addItem("No results")
+
+    def open_search_result(self, item):
+        result = item.data(Qt.UserRole)
+        if not result:
+            return
+        kind, row_id = result
+        page_name = self.SEARCH_RESULT_PAGES[kind]
+        self.change_page(page_name)
+        if row_id is None or self.content.currentWidget() is not self.pages.get(page_name):
+            return
+        page = self.pages[page_name]
+        page.model.seek(row_id, lambda row: self.select_search_result(page, row))
+
+    def select_search_result(self, page, row):
+        if row is None:
+            self.notification_system.show_warning(self, "Not Found", "That record no longer exists.")
+            return
+        index = page.model.index(row, 0)
+        page.table.selectRow(row)
+        page.table.scrollTo(index, QAbstractItemView.PositionAtCenter)
+
     def login(self, username, password):
         user = self.db.authenticate_user(username, password)
         if user:
             self.current_user = user
-            self.content.setCurrentWidget(self.dashboard_page)
             self.update_sidebar_visibility(True)
             self.change_page("Dashboard")
+            if self.prefetch_pages:
+                QTimer.singleShot(0, self.prefetch_next_page)
             return True
         return False
 
@@ -153,6 +249,10 @@ class MainWindow(QMainWindow):
         for button in self.sidebar_buttons:
             button.setVisible(visible)
         self.logout_button.setVisible(visible)
+        self.search_input.setVisible(visible)
+        if not visible:
+            self.search_input.clear()
+            self.search_results.hide()
 
     def toggle_theme(self):
         if self.styleSheet() == self.light_style:
@@ -197,6 +297,15 @@ class MainWindow(QMainWindow):
             background-color: #3949ab;
             border-left: 5px solid #8c9eff;
         }
+        #search-input {
+            margin: 10px;
+        }
+        #search-results {
+            margin: 0 10px;
+            border: none;
+            background-color: #283593;
+            color: white;
+        }
         QPushButton {
             background-color: #3949ab;
             color: white;
@@ -217,7 +326,7 @@ class MainWindow(QMainWindow):
         QLineEdit:focus {
             border: 2px solid #3949ab;
         }
-        QTableWidget {
+        QTableView {
             border: none;
             gridline-color: #e0e0e0;
             background-color: white;
@@ -317,6 +426,15 @@ class MainWindow(QMainWindow):
             background-color: #3949ab;
             border-left: 5px solid #8c9eff;
         }
+        #search-input {
+            margin: 10px;
+        }
+        #search-results {
+            margin: 0 10px;
+            border: none;
+            background-color: #2c2c2c;
+            color: #ffffff;
+        }
         QPushButton {
             background-color: #3949ab;
             color: white;
@@ -338,7 +456,7 @@ class MainWindow(QMainWindow):
         QLineEdit:focus {
             border: 2px solid #3949ab;
         }
-        QTableWidget {
+        QTableView {
             border: none;
             gridline-color: #3c3c3c;
             background-color: #1f1f1f;
@@ -423,3 +541,15 @@ class MainWindow(QMainWindow):
     def show_confirmation(self, title, message):
         return self.notification_system.show_confirmation(self, title, message)
 
+    def submit_write(self, dialog, method, *args, error_title="Save Failed"):
+        # Runs a dialog's write on the background connection, so a writer holding the lock
+        # (the status sweep, telemetry ingest) stalls the dialog rather than the event loop.
+        # The dialog is accepted once the write commits, or re-enabled to retry on failure.
+        dialog.setEnabled(False)
+
+        def failed(message):
+            dialog.setEnabled(True)
+            self.show_error(error_title, message)
+
+        getattr(self.async_db, method)(*args, callback=lambda _: dialog.accept(), error_callback=failed)
+
@@ -0,0 +1,501 @@
+# Ordered schema migrations applied by Database.migrate().
+# Each entry is (version, statements); never edit a released entry, append a new one.
+MIGRATIONS = [
+    (1, [
+        "CREATE INDEX IF NOT EXISTS idx_maintenance_history_machine_date ON maintenance_history (machine_id, maintenance_date)",
+        "CREATE INDEX IF NOT EXISTS idx_inspections_machine_date ON inspections (machine_id, inspection_date)",
+        "CREATE INDEX IF NOT EXISTS idx_inspections_date ON inspections (inspection_date)",
+        "CREATE INDEX IF NOT EXISTS idx_calendar_events_range ON calendar_events (start_date, end_date)",
+        "CREATE INDEX IF NOT EXISTS idx_machines_status ON machines (status)",
+        "CREATE INDEX IF NOT EXISTS idx_work_orders_status_due ON work_orders (status, due_date)",
+        "CREATE INDEX IF NOT EXISTS idx_work_orders_assigned_to ON work_orders (assigned_to)",
+        "CREATE INDEX IF NOT EXISTS idx_resources_status ON resources (status)",
+    ]),
+    (2, [
+        '''
+        CREATE TABLE IF NOT EXISTS machine_status_summary (
+            status TEXT PRIMARY KEY,
+            count INTEGER NOT NULL
+        )
+        ''',
+        "DELETE FROM machine_status_summary",
+        "INSERT INTO machine_status_summary (status, count) SELECT status, COUNT(*) FROM machines GROUP BY status",
+        '''
+        CREATE TRIGGER IF NOT EXISTS machines_status_summary_insert AFTER INSERT ON machines
+        BEGIN
+            INSERT INTO machine_status_summary (status, count) VALUES (NEW.status, 1)
+            ON CONFLICT (status) DO UPDATE SET count = count + 1;
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS machines_status_summary_delete AFTER DELETE ON machines
+        BEGIN
+            UPDATE machine_status_summary SET count = count - 1 WHERE status = OLD.status;
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS machines_status_summary_update AFTER UPDATE OF status ON machines
+        WHEN OLD.status IS NOT NEW.status
+        BEGIN
+            UPDATE machine_status_summary SET count = count - 1 WHERE status = OLD.status;
+            INSERT INTO machine_status_summary (status, count) VALUES (NEW.status, 1)
+            ON CONFLICT (status) DO UPDATE SET count = count + 1;
+        END
+        ''',
+    ]),
+    (3, [
+        "ALTER TABLE machines ADD COLUMN next_maintenance_date TEXT",
+        '''
+        UPDATE machines
+        SET next_maintenance_date = date(COALESCE(last_maintenance_date, installation_date),
+                                         '+' || maintenance_frequency || ' days')
+        ''',
+        "CREATE INDEX IF NOT EXISTS idx_machines_next_maintenance ON machines (next_maintenance_date)",
+        '''
+        CREATE TRIGGER IF NOT EXISTS machines_next_maintenance_insert AFTER INSERT ON machines
+        BEGIN
+            UPDATE machines
+            SET next_maintenance_date = date(COALESCE(NEW.last_maintenance_date, NEW.installation_date),
+                                             '+' || NEW.maintenance_frequency || ' days')
+            WHERE id = NEW.id;
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS machines_next_maintenance_update
+        AFTER UPDATE OF installation_date, maintenance_frequency, last_maintenance_date ON machines
+        BEGIN
+            UPDATE machines
+            SET next_maintenance_date = date(COALESCE(NEW.last_maintenance_date, NEW.installation_date),
+                                             '+' || NEW.maintenance_frequency || ' days')
+            WHERE id = NEW.id;
+        END
+        ''',
+    ]),
+    (4, [
+        '''
+        CREATE TABLE IF NOT EXISTS failure_model_params (
+            machine_type TEXT PRIMARY KEY,
+            intervals INTEGER NOT NULL DEFAULT 0,
+            interval_sum REAL NOT NULL DEFAULT 0,
+            interval_sum_sq REAL NOT NULL DEFAULT 0,
+            inspections INTEGER NOT NULL DEFAULT 0,
+            failures INTEGER NOT NULL DEFAULT 0,
+            weibull_shape REAL,
+            weibull_scale REAL,
+            updated_at TEXT
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS failure_model_state (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            last_history_id INTEGER NOT NULL DEFAULT 0,
+            last_inspection_id INTEGER NOT NULL DEFAULT 0
+        )
+        ''',
+        "INSERT OR IGNORE INTO failure_model_state (id) VALUES (1)",
+    ]),
+    (5, [
+        '''
+        CREATE TABLE IF NOT EXISTS export_state (
+            name TEXT PRIMARY KEY,
+            last_rowid INTEGER NOT NULL,
+            exported_at TEXT NOT NULL
+        )
+        ''',
+    ]),
+    (6, [
+        # status_check_date is the day a machine's predicted status next changes with no
+        # new input; status_sweep_queue holds machines whose inputs changed since the last sweep.
+        "ALTER TABLE machines ADD COLUMN status_check_date TEXT",
+        "CREATE INDEX IF NOT EXISTS idx_machines_status_check ON machines (status_check_date)",
+        "CREATE TABLE IF NOT EXISTS status_sweep_queue (machine_id INTEGER PRIMARY KEY)",
+        "INSERT OR IGNORE INTO status_sweep_queue (machine_id) SELECT id FROM machines",
+        '''
+        CREATE TRIGGER IF NOT EXISTS machines_status_sweep_insert AFTER INSERT ON machines
+        BEGIN
+            INSERT OR IGNORE INTO status_sweep_queue (machine_id) VALUES (NEW.id);
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS machines_status_sweep_update
+        AFTER UPDATE OF installation_date, maintenance_frequency, last_maintenance_date ON machines
+        BEGIN
+            INSERT OR IGNORE INTO status_sweep_queue (machine_id) VALUES (NEW.id);
+        END
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS sweep_runs (
+            id INTEGER PRIMARY KEY,
+            started_at TEXT NOT NULL,
+            duration_ms REAL NOT NULL,
+            rescored INTEGER NOT NULL,
+            changed INTEGER NOT NULL
+        )
+        ''',
+    ]),
+    (7, [
+        # Append-only feed for the dashboard; every write reaches it through these triggers
+        '''
+        CREATE TABLE IF NOT EXISTS activity_log (
+            id INTEGER PRIMARY KEY,
+            created_at TEXT NOT NULL DEFAULT (datetime('now', 'localtime')),
+            kind TEXT NOT NULL,
+            entity_id INTEGER,
+            message TEXT NOT NULL
+        )
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS activity_machine_insert AFTER INSERT ON machines
+        BEGIN
+            INSERT INTO activity_log (kind, entity_id, message)
+            VALUES ('machine', NEW.id, 'Machine ' || NEW.name || ' added');
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS activity_machine_status AFTER UPDATE OF status ON machines
+        WHEN OLD.status IS NOT NEW.status
+        BEGIN
+            INSERT INTO activity_log (kind, entity_id, message)
+            VALUES ('machine', NEW.id, 'Machine ' || NEW.name || ' status changed to ' || NEW.status);
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS activity_maintenance_insert AFTER INSERT ON maintenance_history
+        BEGIN
+            INSERT INTO activity_log (kind, entity_id, message)
+            VALUES ('maintenance', NEW.machine_id,
+                    'Maintenance performed on Machine ' ||
+                    COALESCE((SELECT name FROM machines WHERE id = NEW.machine_id), NEW.machine_id));
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS activity_inspection_insert AFTER INSERT ON inspections
+        BEGIN
+            INSERT INTO activity_log (kind, entity_id, message)
+            VALUES ('inspection', NEW.machine_id,
+                    'Inspection of Machine ' ||
+                    COALESCE((SELECT name FROM machines WHERE id = NEW.machine_id), NEW.machine_id) ||
+                    ': ' || NEW.result);
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS activity_user_insert AFTER INSERT ON users
+        BEGIN
+            INSERT INTO activity_log (kind, entity_id, message)
+            VALUES ('user', NEW.id, 'New user ' || NEW.username || ' added to the system');
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS activity_user_validated AFTER UPDATE OF is_validated ON users
+        WHEN NEW.is_validated AND NOT OLD.is_validated
+        BEGIN
+            INSERT INTO activity_log (kind, entity_id, message)
+            VALUES ('user', NEW.id, 'User ' || NEW.username || ' validated');
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS activity_user_delete AFTER DELETE ON users
+        BEGIN
+            INSERT INTO activity_log (kind, entity_id, message)
+            VALUES ('user', OLD.id, 'User ' || OLD.username || ' deleted');
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS activity_work_order_insert AFTER INSERT ON work_orders
+        BEGIN
+            INSERT INTO activity_log (kind, entity_id, message)
+            VALUES ('work_order', NEW.id, 'Work order #' || NEW.id || ' created: ' || NEW.title);
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS activity_work_order_status AFTER UPDATE OF status ON work_orders
+        WHEN OLD.status IS NOT NEW.status
+        BEGIN
+            INSERT INTO activity_log (kind, entity_id, message)
+            VALUES ('work_order', NEW.id, 'Work order #' || NEW.id || ' status changed to ' || NEW.status);
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS activity_inventory_insert AFTER INSERT ON inventory
+        BEGIN
+            INSERT INTO activity_log (kind, entity_id, message)
+            VALUES ('inventory', NEW.id, 'Inventory item ' || NEW.item_name || ' added');
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS activity_inventory_low AFTER UPDATE OF quantity, reorder_level ON inventory
+        WHEN NEW.quantity <= NEW.reorder_level AND OLD.quantity > OLD.reorder_level
+        BEGIN
+            INSERT INTO activity_log (kind, entity_id, message)
+            VALUES ('inventory', NEW.id, 'Inventory low alert for ' || NEW.item_name);
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS activity_resource_insert AFTER INSERT ON resources
+        BEGIN
+            INSERT INTO activity_log (kind, entity_id, message)
+            VALUES ('resource', NEW.id, 'Resource ' || NEW.name || ' added');
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS activity_resource_status AFTER UPDATE OF status ON resources
+        WHEN OLD.status IS NOT NEW.status
+        BEGIN
+            INSERT INTO activity_log (kind, entity_id, message)
+            VALUES ('resource', NEW.id, 'Resource ' || NEW.name || ' is now ' || NEW.status);
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS activity_calendar_event_insert AFTER INSERT ON calendar_events
+        BEGIN
+            INSERT INTO activity_log (kind, entity_id, message)
+            VALUES ('calendar', NEW.id, NEW.event_type || ' scheduled: ' || NEW.title);
+        END
+        ''',
+    ]),
+    (8, [
+        # Only rows at or below their reorder level are in this index, so the
+        # shortfall query touches just those rows however large the inventory is
+        "CREATE INDEX IF NOT EXISTS idx_inventory_low_stock ON inventory (id) WHERE quantity <= reorder_level",
+        '''
+        CREATE TABLE IF NOT EXISTS low_stock (
+            item_id INTEGER PRIMARY KEY,
+            shortfall INTEGER NOT NULL,
+            flagged_at TEXT NOT NULL DEFAULT (datetime('now', 'localtime'))
+        )
+        ''',
+        '''
+        INSERT OR IGNORE INTO low_stock (item_id, shortfall)
+        SELECT id, reorder_level - quantity FROM inventory WHERE quantity <= reorder_level
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS inventory_low_stock_insert AFTER INSERT ON inventory
+        WHEN NEW.quantity <= NEW.reorder_level
+        BEGIN
+            INSERT OR REPLACE INTO low_stock (item_id, shortfall) VALUES (NEW.id, NEW.reorder_level - NEW.quantity);
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS inventory_low_stock_update AFTER UPDATE OF quantity, reorder_level ON inventory
+        BEGIN
+            DELETE FROM low_stock WHERE item_id = NEW.id AND NEW.quantity > NEW.reorder_level;
+            INSERT INTO low_stock (item_id, shortfall)
+            SELECT NEW.id, NEW.reorder_level - NEW.quantity WHERE NEW.quantity <= NEW.reorder_level
+            ON CONFLICT (item_id) DO UPDATE SET shortfall = excluded.shortfall;
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS inventory_low_stock_delete AFTER DELETE ON inventory
+        BEGIN
+            DELETE FROM low_stock WHERE item_id = OLD.id;
+        END
+        ''',
+    ]),
+    (9, [
+        '''
+        CREATE TABLE IF NOT EXISTS parts_used (
+            id INTEGER PRIMARY KEY,
+            maintenance_id INTEGER NOT NULL,
+            item_id INTEGER NOT NULL,
+            quantity INTEGER NOT NULL CHECK (quantity > 0),
+            FOREIGN KEY (maintenance_id) REFERENCES maintenance_history (id),
+            FOREIGN KEY (item_id) REFERENCES inventory (id)
+        )
+        ''',
+        "CREATE INDEX IF NOT EXISTS idx_parts_used_maintenance ON parts_used (maintenance_id)",
+        "CREATE INDEX IF NOT EXISTS idx_parts_used_item ON parts_used (item_id)",
+    ]),
+    (10, [
+        # External-content FTS5 indexes: the text stays in the source tables and the
+        # triggers keep the indexes in step with every insert, update and delete
+        '''
+        CREATE VIRTUAL TABLE IF NOT EXISTS work_orders_fts USING fts5(
+            title, description, content='work_orders', content_rowid='id', tokenize='porter unicode61', prefix='2 3'
+        )
+        ''',
+        "INSERT INTO work_orders_fts (work_orders_fts) VALUES ('rebuild')",
+        '''
+        CREATE TRIGGER IF NOT EXISTS work_orders_fts_insert AFTER INSERT ON work_orders
+        BEGIN
+            INSERT INTO work_orders_fts (rowid, title, description) VALUES (NEW.id, NEW.title, NEW.description);
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS work_orders_fts_delete AFTER DELETE ON work_orders
+        BEGIN
+            INSERT INTO work_orders_fts (work_orders_fts, rowid, title, description)
+            VALUES ('delete', OLD.id, OLD.title, OLD.description);
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS work_orders_fts_update AFTER UPDATE OF title, description ON work_orders
+        BEGIN
+            INSERT INTO work_orders_fts (work_orders_fts, rowid, title, description)
+            VALUES ('delete', OLD.id, OLD.title, OLD.description);
+            INSERT INTO work_orders_fts (rowid, title, description) VALUES (NEW.id, NEW.title, NEW.description);
+        END
+        ''',
+        '''
+        CREATE VIRTUAL TABLE IF NOT EXISTS inspections_fts USING fts5(
+            result, notes, content='inspections', content_rowid='id', tokenize='porter unicode61', prefix='2 3'
+        )
+        ''',
+        "INSERT INTO inspections_fts (inspections_fts) VALUES ('rebuild')",
+        '''
+        CREATE TRIGGER IF NOT EXISTS inspections_fts_insert AFTER INSERT ON inspections
+        BEGIN
+            INSERT INTO inspections_fts (rowid, result, notes) VALUES (NEW.id, NEW.result, NEW.notes);
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS inspections_fts_delete AFTER DELETE ON inspections
+        BEGIN
+            INSERT INTO inspections_fts (inspections_fts, rowid, result, notes)
+            VALUES ('delete', OLD.id, OLD.result, OLD.notes);
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS inspections_fts_update AFTER UPDATE OF result, notes ON inspections
+        BEGIN
+            INSERT INTO inspections_fts (inspections_fts, rowid, result, notes)
+            VALUES ('delete', OLD.id, OLD.result, OLD.notes);
+            INSERT INTO inspections_fts (rowid, result, notes) VALUES (NEW.id, NEW.result, NEW.notes);
+        END
+        ''',
+        '''
+        CREATE VIRTUAL TABLE IF NOT EXISTS maintenance_history_fts USING fts5(
+            description, content='maintenance_history', content_rowid='id', tokenize='porter unicode61', prefix='2 3'
+        )
+        ''',
+        "INSERT INTO maintenance_history_fts (maintenance_history_fts) VALUES ('rebuild')",
+        '''
+        CREATE TRIGGER IF NOT EXISTS maintenance_history_fts_insert AFTER INSERT ON maintenance_history
+        BEGIN
+            INSERT INTO maintenance_history_fts (rowid, description) VALUES (NEW.id, NEW.description);
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS maintenance_history_fts_delete AFTER DELETE ON maintenance_history
+        BEGIN
+            INSERT INTO maintenance_history_fts (maintenance_history_fts, rowid, description)
+            VALUES ('delete', OLD.id, OLD.description);
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS maintenance_history_fts_update AFTER UPDATE OF description ON maintenance_history
+        BEGIN
+            INSERT INTO maintenance_history_fts (maintenance_history_fts, rowid, description)
+            VALUES ('delete', OLD.id, OLD.description);
+            INSERT INTO maintenance_history_fts (rowid, description) VALUES (NEW.id, NEW.description);
+        END
+        ''',
+    ]),
+    (11, [
+        # One reading per machine per millisecond (ts is Unix time in ms); clustering on
+        # the key keeps each machine's series contiguous for range scans
+        '''
+        CREATE TABLE IF NOT EXISTS telemetry (
+            machine_id INTEGER NOT NULL,
+            ts INTEGER NOT NULL,
+            value REAL NOT NULL,
+            PRIMARY KEY (machine_id, ts)
+        ) WITHOUT ROWID
+        ''',
+    ]),
+    (12, [
+        # Rollup tiers of telemetry; bucket is the tier-aligned start of the interval in ms
+        '''
+        CREATE TABLE IF NOT EXISTS telemetry_1m (
+            machine_id INTEGER NOT NULL,
+            bucket INTEGER NOT NULL,
+            min REAL NOT NULL,
+            max REAL NOT NULL,
+            sum REAL NOT NULL,
+            count INTEGER NOT NULL,
+            PRIMARY KEY (machine_id, bucket)
+        ) WITHOUT ROWID
+        ''',
+        '''
+        INSERT OR REPLACE INTO telemetry_1m (machine_id, bucket, min, max, sum, count)
+        SELECT machine_id, ts - ts % 60000, MIN(value), MAX(value), SUM(value), COUNT(*)
+        FROM telemetry
+        GROUP BY machine_id, ts - ts % 60000
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS telemetry_1h (
+            machine_id INTEGER NOT NULL,
+            bucket INTEGER NOT NULL,
+            min REAL NOT NULL,
+            max REAL NOT NULL,
+            sum REAL NOT NULL,
+            count INTEGER NOT NULL,
+            PRIMARY KEY (machine_id, bucket)
+        ) WITHOUT ROWID
+        ''',
+        '''
+        INSERT OR REPLACE INTO telemetry_1h (machine_id, bucket, min, max, sum, count)
+        SELECT machine_id, ts - ts % 3600000, MIN(value), MAX(value), SUM(value), COUNT(*)
+        FROM telemetry
+        GROUP BY machine_id, ts - ts % 3600000
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS telemetry_1d (
+            machine_id INTEGER NOT NULL,
+            bucket INTEGER NOT NULL,
+            min REAL NOT NULL,
+            max REAL NOT NULL,
+            sum REAL NOT NULL,
+            count INTEGER NOT NULL,
+            PRIMARY KEY (machine_id, bucket)
+        ) WITHOUT ROWID
+        ''',
+        '''
+        INSERT OR REPLACE INTO telemetry_1d (machine_id, bucket, min, max, sum, count)
+        SELECT machine_id, ts - ts % 86400000, MIN(value), MAX(value), SUM(value), COUNT(*)
+        FROM telemetry
+        GROUP BY machine_id, ts - ts % 86400000
+        ''',
+    ]),
+    (13, [
+        # Only real input changes queue a machine, so a status-only edit is not swept away
+        "DROP TRIGGER IF EXISTS machines_status_sweep_update",
+        '''
+        CREATE TRIGGER IF NOT EXISTS machines_status_sweep_update
+        AFTER UPDATE OF installation_date, maintenance_frequency, last_maintenance_date ON machines
+        WHEN OLD.installation_date IS NOT NEW.installation_date
+            OR OLD.maintenance_frequency IS NOT NEW.maintenance_frequency
+            OR OLD.last_maintenance_date IS NOT NEW.last_maintenance_date
+        BEGIN
+            INSERT OR IGNORE INTO status_sweep_queue (machine_id) VALUES (NEW.id);
+        END
+        ''',
+    ]),
+    (14, [
+        # machine_id is nullable, and a NULL in the concatenation broke the NOT NULL message
+        "DROP TRIGGER IF EXISTS activity_maintenance_insert",
+        '''
+        CREATE TRIGGER IF NOT EXISTS activity_maintenance_insert AFTER INSERT ON maintenance_history
+        BEGIN
+            INSERT INTO activity_log (kind, entity_id, message)
+            VALUES ('maintenance', NEW.machine_id,
+                    'Maintenance performed on Machine ' ||
+                    COALESCE((SELECT name FROM machines WHERE id = NEW.machine_id), NEW.machine_id, 'unknown'));
+        END
+        ''',
+        "DROP TRIGGER IF EXISTS activity_inspection_insert",
+        '''
+        CREATE TRIGGER IF NOT EXISTS activity_inspection_insert AFTER INSERT ON inspections
+        BEGIN
+            INSERT INTO activity_log (kind, entity_id, message)
+            VALUES ('inspection', NEW.machine_id,
+                    'Inspection of Machine ' ||
+                    COALESCE((SELECT name FROM machines WHERE id = NEW.machine_id), NEW.machine_id, 'unknown') ||
+                    ': ' || NEW.result);
+        END
+        ''',
+    ]),
+    (15, [
+        # NOCASE so case-insensitive LIKE 'prefix%' lookups can use it
+        "CREATE INDEX IF NOT EXISTS idx_inventory_name ON inventory (item_name COLLATE NOCASE)",
+    ]),
+]
@@ -1,6 +1,13 @@
+import math
 import random
 from datetime import datetime, timedelta
 
+import numpy as np
+
+# Status codes returned by the batch methods, indexing into the label arrays below
+PREDICTION_LABELS = np.array(["OK", "Maintenance Due Soon", "Maintenance Required"])
+REMAINING_LIFE_LABELS = np.array(["Good", "Warning", "Critical", "Immediate Maintenance Required"])
+
 class PredictiveMaintenance:
     @staticmethod
     def predict_next_maintenance(machine):
@@ -43,69 +50,186 @@ class PredictiveMaintenance:
         else:
             return f"Good: {remaining_life} days remaining"
 
-This completes the `PredictiveMaintenance` class in the `utils/predictive_maintenance.py` file. The class now includes two static methods: `predict_next_maintenance` and `estimate_remaining_life`, which provide basic predictive maintenance functionality for the machines in the system.
-
-To integrate these predictive maintenance features into the main application, you would typically call these methods from the `MachinesPage` or a dedicated predictive maintenance page. For example, you could add a "Predict Maintenance" button to each machine in the machines table, which would call these methods and display the results to the user.
-
-Here's an example of how you might modify the `MachinesPage` to include predictive maintenance information:
-
-```python project="Advanced Dashboard" file="ui/machines_page.py" type="code"
-from PyQt5.QtWidgets import QWidget, QVBoxLayout, QTableWidget, QTableWidgetItem, QPushButton, QHBoxLayout
-from utils.predictive_maintenance import PredictiveMaintenance
-
-class MachinesPage(QWidget):
-    def __init__(self, main_window):
-        super().__init__()
-        self.main_window = main_window
-        layout = QVBoxLayout(self)
-
-        self.table = QTableWidget()
-        self.table.setColumnCount(7)
-        self.table.setHorizontalHeaderLabels(["Name", "Type", "Status", "Next Maintenance", "Location", "Predicted Status", "Actions"])
-
-        add_machine_button = QPushButton("Add Machine")
-        add_machine_button.clicked.connect(self.show_add_machine_dialog)
-
-        layout.addWidget(self.table)
-        layout.addWidget(add_machine_button)
-
-        self.update_table()
-
-    def update_table(self):
-        self.table.setRowCount(0)
-        machines = self.main_window.db.get_machines()
-        for machine in machines:
-            row_position = self.table.rowCount()
-            self.table.insertRow(row_position)
-            
-            self.table.setItem(row_position, 0, QTableWidgetItem(machine[1]))
-            self.table.setItem(row_position, 1, QTableWidgetItem(machine[2]))
-            self.table.setItem(row_position, 2, QTableWidgetItem(machine[7]))
-            
-            next_maintenance = self.calculate_next_maintenance(machine[4], machine[5], machine[6])
-            self.table.setItem(row_position, 3, QTableWidgetItem(next_maintenance))
-            
-            self.table.setItem(row_position, 4, QTableWidgetItem(machine[3]))
-
-            predicted_status = PredictiveMaintenance.predict_next_maintenance(machine)
-            self.table.setItem(row_position, 5, QTableWidgetItem(predicted_status))
-            
-            actions_widget = QWidget()
-            actions_layout = QHBoxLayout(actions_widget)
-            edit_button = QPushButton("Edit")
-            edit_button.clicked.connect(lambda _, m=machine: self.edit_machine(m))
-            actions_layout.addWidget(edit_button)
-            predict_button = QPushButton("Predict Life")
-            predict_button.clicked.connect(lambda _, m=machine: self.predict_machine_life(m))
-            actions_layout.addWidget(predict_button)
-            self.table.setCellWidget(row_position, 6, actions_widget)
-
-    def predict_machine_life(self, machine):
-        remaining_life = PredictiveMaintenance.estimate_remaining_life(machine)
-        self.main_window.notification_system.show_notification(
-            self, 
-            "Machine Life Prediction", 
-            f"Machine: {machine[1]}\nPredicted Remaining Life: {remaining_life}"
-        )
-
-    # ... (rest of the MachinesPage class remains the same)
\ No newline at end of file
+    @staticmethod
+    def machine_arrays(machines):
+        # Converts a machines result set into (ids, last maintenance as int days since epoch, frequencies).
+        # The installation date stands in for machines that were never maintained.
+        ids = np.fromiter((machine[0] for machine in machines), dtype=np.int64, count=len(machines))
+        last_maintenance = np.array([machine[6] or machine[4] for machine in machines],
+                                    dtype='datetime64[D]').astype(np.int64)
+        frequencies = np.fromiter((machine[5] for machine in machines), dtype=np.int64, count=len(machines))
+        return ids, last_maintenance, frequencies
+
+    @staticmethod
+    def today_days():
+        return np.datetime64(datetime.now().date(), 'D').astype(np.int64)
+
+    @staticmethod
+    def predict_next_maintenance_batch(last_maintenance, maintenance_frequency, today=None, rng=None,
+                                       wear_factor=None):
+        # Vectorized predict_next_maintenance: returns status codes into PREDICTION_LABELS.
+        # rng may be a seed or a numpy Generator, for reproducible wear factors; a fixed
+        # wear_factor makes the prediction deterministic.
+        today = PredictiveMaintenance.today_days() if today is None else today
+        days_since_last_maintenance = today - last_maintenance
+        if wear_factor is None:
+            wear_factor = np.random.default_rng(rng).uniform(0.8, 1.2, size=len(maintenance_frequency))
+        predicted_days = (maintenance_frequency * wear_factor).astype(np.int64)
+
+        status = np.zeros(len(maintenance_frequency), dtype=np.int8)
+        status[days_since_last_maintenance >= predicted_days * 0.8] = 1
+        status[days_since_last_maintenance >= predicted_days] = 2
+        return status
+
+    @staticmethod
+    def estimate_remaining_life_batch(last_maintenance, maintenance_frequency, today=None, rng=None):
+        # Vectorized estimate_remaining_life: returns (remaining days, codes into REMAINING_LIFE_LABELS)
+        rng = np.random.default_rng(rng)
+        today = PredictiveMaintenance.today_days() if today is None else today
+        days_since_last_maintenance = today - last_maintenance
+        wear_factor = rng.uniform(0.8, 1.2, size=len(maintenance_frequency))
+        estimated_life = (maintenance_frequency * wear_factor).astype(np.int64)
+        remaining_life = estimated_life - days_since_last_maintenance
+
+        status = np.zeros(len(maintenance_frequency), dtype=np.int8)
+        status[remaining_life <= estimated_life * 0.5] = 1
+        status[remaining_life <= estimated_life * 0.2] = 2
+        status[remaining_life <= 0] = 3
+        return remaining_life, status
+
+class FailureModel:
+    # Per machine type Weibull model of the time between maintenances, fitted from
+    # maintenance_history, plus the failure rate observed in inspections. The sufficient
+    # statistics (count, sum, sum of squares) live in failure_model_params, so fit() only
+    # reads the history and inspection rows added since the previous fit.
+    MIN_INTERVALS = 3
+    MAX_SHAPE = 20.0
+
+    def __init__(self, db):
+        self.db = db
+        self.params = None
+
+    def fit(self):
+        last_history_id, last_inspection_id, max_history_id, max_inspection_id = self.db.get_failure_model_state()
+        stats = {row[0]: list(row[1:6]) for row in self.db.get_failure_model_params()}
+
+        if max_history_id > last_history_id:
+            rows = self.db.get_maintenance_intervals(last_history_id, max_history_id)
+            if rows:
+                types = np.array([row[0] for row in rows])
+                days = np.array([row[1] for row in rows], dtype=float)
+                valid = days > 0
+                names, inverse = np.unique(types[valid], return_inverse=True)
+                counts = np.bincount(inverse, minlength=len(names))
+                sums = np.bincount(inverse, weights=days[valid], minlength=len(names))
+                sums_sq = np.bincount(inverse, weights=days[valid] ** 2, minlength=len(names))
+                for name, count, total, total_sq in zip(names, counts, sums, sums_sq):
+                    entry = stats.setdefault(str(name), [0, 0.0, 0.0, 0, 0])
+                    entry[0] += int(count)
+                    entry[1] += float(total)
+                    entry[2] += float(total_sq)
+
+        if max_inspection_id > last_inspection_id:
+            rows = self.db.get_inspection_outcomes(last_inspection_id, max_inspection_id)
+            if rows:
+                types = np.array([row[0] for row in rows])
+                failed = np.array([row[1] for row in rows], dtype=np.int64)
+                names, inverse = np.unique(types, return_inverse=True)
+                counts = np.bincount(inverse, minlength=len(names))
+                failures = np.bincount(inverse, weights=failed, minlength=len(names))
+                for name, count, failure_count in zip(names, counts, failures):
+                    entry = stats.setdefault(str(name), [0, 0.0, 0.0, 0, 0])
+                    entry[3] += int(count)
+                    entry[4] += int(failure_count)
+
+        params = []
+        for machine_type, (intervals, interval_sum, interval_sum_sq, inspections, failures) in stats.items():
+            shape, scale = self.weibull_parameters(intervals, interval_sum, interval_sum_sq)
+            params.append((machine_type, intervals, interval_sum, interval_sum_sq, inspections, failures,
+                           shape, scale))
+        self.db.save_failure_model_params(params, max_history_id, max_inspection_id)
+        self.load()
+        return self.params
+
+    def load(self):
+        # machine type -> (Weibull shape, Weibull scale in days, inspection failure rate)
+        self.params = {}
+        for machine_type, intervals, _, _, inspections, failures, shape, scale in self.db.get_failure_model_params():
+            failure_rate = failures / inspections if inspections else 0.0
+            self.params[machine_type] = (shape, scale, failure_rate)
+        return self.params
+
+    @classmethod
+    def weibull_parameters(cls, count, total, total_sq):
+        # Method of moments: the coefficient of variation fixes the shape, the mean the scale
+        if count < cls.MIN_INTERVALS or total <= 0:
+            return None, None
+        mean = total / count
+        variance = max(total_sq / count - mean * mean, 0.0)
+        cv = math.sqrt(variance) / mean
+
+        def weibull_cv(shape):
+            g1 = math.gamma(1 + 1 / shape)
+            return math.sqrt(max(math.gamma(1 + 2 / shape) / (g1 * g1) - 1, 0.0))
+
+        low, high = 0.1, cls.MAX_SHAPE
+        if cv <= weibull_cv(high):
+            shape = high
+        elif cv >= weibull_cv(low):
+            shape = low
+        else:
+            for _ in range(60):
+                middle = (low + high) / 2
+                if weibull_cv(middle) > cv:
+                    low = middle
+                else:
+                    high = middle
+            shape = (low + high) / 2
+        return shape, mean / math.gamma(1 + 1 / shape)
+
+    def fitted_arrays(self, machines):
+        # Returns (last maintenance as int days, frequencies, Weibull shape, Weibull scale,
+        # inspection failure rate) per machine; shape and scale are NaN for unfitted types
+        if self.params is None:
+            self.load()
+        _, last_maintenance, frequencies = PredictiveMaintenance.machine_arrays(machines)
+        types = np.array([machine[2] for machine in machines])
+        names, inverse = np.unique(types, return_inverse=True)
+        fitted = [self.params.get(str(name), (None, None, 0.0)) for name in names]
+        shape = np.array([p[0] if p[0] else np.nan for p in fitted], dtype=float)[inverse]
+        scale = np.array([p[1] if p[1] else np.nan for p in fitted], dtype=float)[inverse]
+        failure_rate = np.array([p[2] for p in fitted], dtype=float)[inverse]
+        return last_maintenance, frequencies, shape, scale, failure_rate
+
+    def service_intervals(self, machines):
+        # Returns (last maintenance as int days, expected days between maintenances): the
+        # fitted Weibull median for types with enough history, else the configured frequency
+        last_maintenance, frequencies, shape, scale, _ = self.fitted_arrays(machines)
+        unfitted = np.isnan(shape)
+        median = scale * math.log(2) ** (1 / np.where(unfitted, 1.0, shape))
+        intervals = np.where(unfitted, frequencies, np.maximum(np.rint(np.nan_to_num(median)), 1)).astype(np.int64)
+        return last_maintenance, intervals
+
+    def predict(self, machines, horizon_days=30, today=None):
+        # Returns (probability of needing maintenance within horizon_days, median remaining
+        # life in days, status codes into PREDICTION_LABELS) for a machines result set.
+        # The status applies the deterministic 80%/100% thresholds to each machine's
+        # service_intervals, so a machine just maintained is always OK. Types without enough
+        # history fall back to an exponential model for the probability and remaining life.
+        last_maintenance, frequencies, shape, scale, failure_rate = self.fitted_arrays(machines)
+        today = PredictiveMaintenance.today_days() if today is None else today
+        age = np.maximum(today - last_maintenance, 0).astype(float)
+
+        unfitted = np.isnan(shape)
+        shape[unfitted] = 1.0
+        scale[unfitted] = frequencies[unfitted]
+
+        cumulative_hazard = (age / scale) ** shape
+        survival_ratio = np.exp(cumulative_hazard - ((age + horizon_days) / scale) ** shape)
+        probability = 1 - survival_ratio * (1 - failure_rate)
+        remaining_life = scale * (cumulative_hazard + math.log(2)) ** (1 / shape) - age
+
+        _, intervals = self.service_intervals(machines)
+        status = PredictiveMaintenance.predict_next_maintenance_batch(last_maintenance, intervals, today,
+                                                                      wear_factor=1.0)
+        return probability, remaining_life, status
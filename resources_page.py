@@ -1,4 +1,6 @@
-from PyQt5.QtWidgets import QWidget, QVBoxLayout, QTableWidget, QTableWidgetItem, QPushButton, QDialog, QFormLayout, QLineEdit, QComboBox
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QPushButton, QDialog, QFormLayout, QLineEdit, QComboBox
+
+from table_model import LazyTableModel, create_table_view, set_action_column
 
 class ResourcesPage(QWidget):
     def __init__(self, main_window):
@@ -6,9 +8,12 @@ class ResourcesPage(QWidget):
         self.main_window = main_window
         layout = QVBoxLayout(self)
 
-        self.table = QTableWidget()
-        self.table.setColumnCount(5)
-        self.table.setHorizontalHeaderLabels(["Name", "Type", "Status", "Location", "Actions"])
+        self.model = LazyTableModel(
+            ["Name", "Type", "Status", "Location", "Actions"],
+            [1, 2, 3, 4],
+            self.main_window.async_db.get_resources, asynchronous=True)
+        self.table = create_table_view(self.model)
+        set_action_column(self.table, 4, [("Edit", self.edit_resource)])
 
         add_resource_button = QPushButton("Add Resource")
         add_resource_button.clicked.connect(self.show_add_resource_dialog)
@@ -19,20 +24,7 @@ class ResourcesPage(QWidget):
         self.update_table()
 
     def update_table(self):
-        self.table.setRowCount(0)
-        resources = self.main_window.db.get_resources()
-        for resource in resources:
-            row_position = self.table.rowCount()
-            self.table.insertRow(row_position)
-            
-            self.table.setItem(row_position, 0, QTableWidgetItem(resource[1]))
-            self.table.setItem(row_position, 1, QTableWidgetItem(resource[2]))
-            self.table.setItem(row_position, 2, QTableWidgetItem(resource[3]))
-            self.table.setItem(row_position, 3, QTableWidgetItem(resource[4]))
-
-            edit_button = QPushButton("Edit")
-            edit_button.clicked.connect(lambda _, r=resource: self.edit_resource(r))
-            self.table.setCellWidget(row_position, 4, edit_button)
+        self.model.refresh()
 
     def show_add_resource_dialog(self):
         dialog = AddResourceDialog(self.main_window)
@@ -108,10 +100,4 @@ class EditResourceDialog(QDialog):
         status = self.status_input.currentText()
         location = self.location_input.text()
 
-        self.main_window.db.cursor.execute('''
-        UPDATE resources 
-        SET name = ?, type = ?, status = ?, location = ?
-        WHERE id = ?
-        ''', (name, resource_type, status, location, self.resource[0]))
-        self.main_window.db.conn.commit()
-        self.accept()
\ No newline at end of file
+        self.main_window.submit_write(self, 'update_resource', self.resource[0], name, resource_type, status, location)
\ No newline at end of file
@@ -0,0 +1,42 @@
+import json
+import platform
+import time
+from contextlib import contextmanager
+
+class StartupProfile:
+    # Records named startup phases; a disabled profile makes phase() a no-op so the
+    # instrumentation can stay in place for normal runs.
+    def __init__(self, enabled=True, started=None):
+        self.enabled = enabled
+        self.started = time.perf_counter() if started is None else started
+        self.phases = []
+
+    @contextmanager
+    def phase(self, name):
+        if not self.enabled:
+            yield
+            return
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, started, time.perf_counter())
+
+    def record(self, name, started, finished):
+        self.phases.append({
+            "phase": name,
+            "start_ms": round((started - self.started) * 1000, 3),
+            "duration_ms": round((finished - started) * 1000, 3),
+        })
+
+    def report(self):
+        return {
+            "total_ms": round((time.perf_counter() - self.started) * 1000, 3),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "phases": sorted(self.phases, key=lambda phase: phase["start_ms"]),
+        }
+
+    def write(self, path):
+        with open(path, 'w') as f:
+            json.dump(self.report(), f, indent=2)
@@ -0,0 +1,139 @@
+import argparse
+import threading
+import time
+from datetime import datetime
+
+import numpy as np
+
+from database import Database
+from predictive_maintenance import FailureModel, PredictiveMaintenance
+
+# Prediction codes (see PREDICTION_LABELS) -> machines.status
+SWEEP_STATUSES = np.array(["Healthy", "Warning", "Critical"])
+
+class StatusSweep:
+    # Recomputes machines.status from PredictiveMaintenance. With the wear factor fixed the
+    # prediction only moves when a machine's inputs change or the calendar reaches its next
+    # threshold, so each sweep reads just the machines in status_sweep_queue (filled by
+    # triggers) or whose status_check_date is due, and the cost follows churn, not fleet size.
+    # With a FailureModel the same thresholds apply to each type's fitted service interval
+    # instead of the configured frequency, and the fleet is requeued whenever a refit
+    # changes the model.
+    def __init__(self, db, batch_size=10000, model=None):
+        self.db = db
+        self.batch_size = batch_size
+        self.model = model
+        self.model_params = None
+
+    @staticmethod
+    def has_valid_inputs(machine):
+        # machine_arrays needs ISO dates and an integer frequency; imported rows may have neither
+        try:
+            np.datetime64(machine[6] or machine[4], 'D')
+        except (TypeError, ValueError):
+            return False
+        return isinstance(machine[5], int)
+
+    def score(self, machines, today):
+        # Returns (status labels, next status check dates) for a machines result set
+        if self.model is not None:
+            last_maintenance, frequencies = self.model.service_intervals(machines)
+        else:
+            _, last_maintenance, frequencies = PredictiveMaintenance.machine_arrays(machines)
+        codes = PredictiveMaintenance.predict_next_maintenance_batch(last_maintenance, frequencies, today,
+                                                                     wear_factor=1.0)
+        # First day each threshold of predict_next_maintenance_batch is crossed
+        warning_day = last_maintenance + np.ceil(frequencies * 0.8).astype(np.int64)
+        critical_day = last_maintenance + frequencies
+        check_day = np.where(codes == 0, warning_day, critical_day).astype('datetime64[D]').astype(str)
+        check_dates = [None if code == 2 else day for code, day in zip(codes, check_day)]
+        return SWEEP_STATUSES[codes], check_dates
+
+    def run(self):
+        started_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        started = time.perf_counter()
+        today = PredictiveMaintenance.today_days()
+        today_text = str(np.datetime64(int(today), 'D'))
+        rescored = changed = 0
+        if self.model is not None:
+            # fit() only reads history added since the previous fit
+            params = self.model.fit()
+            if params != self.model_params:
+                self.db.queue_all_machines_for_sweep()
+                self.model_params = params
+        while True:
+            with self.db.transaction():
+                queued, machines = self.db.get_status_sweep_batch(today_text, self.batch_size)
+                if not queued and not machines:
+                    break
+                updates = []
+                # Rows that cannot be scored keep their status and leave the queue and the due
+                # list (check date cleared) until an edit to their inputs queues them again
+                skipped = [machine for machine in machines if not self.has_valid_inputs(machine)]
+                if skipped:
+                    updates.extend((machine[7], None, machine[0]) for machine in skipped if machine[9] is not None)
+                    machines = [machine for machine in machines if self.has_valid_inputs(machine)]
+                if machines:
+                    statuses, check_dates = self.score(machines, today)
+                    for machine, status, check_date in zip(machines, statuses, check_dates):
+                        if machine[7] != status or machine[9] != check_date:
+                            updates.append((str(status), check_date, machine[0]))
+                        changed += int(machine[7] != status)
+                    rescored += len(machines)
+                self.db.save_status_sweep_batch(updates, queued)
+        duration_ms = (time.perf_counter() - started) * 1000
+        self.db.add_sweep_run(started_at, duration_ms, rescored, changed)
+        return rescored, changed, duration_ms
+
+class StatusSweepThread(threading.Thread):
+    # Runs a sweep every interval seconds on its own connection until stop() is called
+    def __init__(self, db_name='dashboard.db', interval=900, batch_size=10000, db_options=None, failure_model=False):
+        super().__init__(daemon=True)
+        self.db_name = db_name
+        self.interval = interval
+        self.batch_size = batch_size
+        self.failure_model = failure_model
+        self.db_options = db_options or {}
+        self.stopped = threading.Event()
+
+    def run(self):
+        db = Database(self.db_name, **self.db_options)
+        try:
+            sweep = StatusSweep(db, self.batch_size, FailureModel(db) if self.failure_model else None)
+            while not self.stopped.is_set():
+                try:
+                    sweep.run()
+                except Exception as e:
+                    print(f"Status sweep failed: {e}")
+                self.stopped.wait(self.interval)
+        finally:
+            db.close()
+
+    def stop(self):
+        self.stopped.set()
+
+def main():
+    parser = argparse.ArgumentParser(description="Update machine statuses from maintenance predictions")
+    parser.add_argument('--db', default='dashboard.db')
+    parser.add_argument('--batch-size', type=int, default=10000)
+    parser.add_argument('--interval', type=float, help="keep running, sweeping every INTERVAL seconds")
+    parser.add_argument('--failure-model', action='store_true',
+                        help="score with the failure model fitted from maintenance and inspection history")
+    args = parser.parse_args()
+
+    db = Database(args.db)
+    sweep = StatusSweep(db, args.batch_size, FailureModel(db) if args.failure_model else None)
+    try:
+        while True:
+            rescored, changed, duration_ms = sweep.run()
+            print(f"Rescored {rescored} machines, {changed} status changes in {duration_ms:.1f} ms")
+            if args.interval is None:
+                break
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        db.close()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,194 @@
+from bisect import bisect_left
+
+from PyQt5.QtWidgets import (QTableView, QAbstractItemView, QHeaderView, QStyledItemDelegate,
+                             QStyleOptionButton, QStyle, QApplication)
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QEvent, QRect, QSize, QTimer
+from PyQt5.QtGui import QBrush
+
+class LazyTableModel(QAbstractTableModel):
+    # Rows are pulled from the database in keyset-paginated pages (WHERE id > last_id LIMIT n)
+    # as the view scrolls, so only the rows the user has reached are ever held in memory.
+    # With asynchronous=True, fetch_page is an AsyncDatabase method: it is passed a callback
+    # and the page is inserted when the background query completes.
+    # highlight(row) may return a background color for the row, or None.
+    SEEK_PAGE_SIZE = 5000
+    def __init__(self, headers, columns, fetch_page, page_size=100, asynchronous=False, highlight=None):
+        super().__init__()
+        self.headers = headers
+        self.columns = columns
+        self.fetch_page = fetch_page
+        self.page_size = page_size
+        self.asynchronous = asynchronous
+        self.highlight = highlight
+        self.rows = []
+        self.last_id = 0
+        self.exhausted = False
+        self.pending = False
+        self.generation = 0
+        self.seek_target = None
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.headers)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.headers[section]
+        return super().headerData(section, orientation, role)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.BackgroundRole and self.highlight:
+            color = self.highlight(self.rows[index.row()])
+            return QBrush(color) if color else None
+        if role != Qt.DisplayRole:
+            return None
+        column = self.columns[index.column()] if index.column() < len(self.columns) else None
+        if column is None:
+            return None
+        row = self.rows[index.row()]
+        value = column(row) if callable(column) else row[column]
+        return "" if value is None else str(value)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and not self.exhausted and not self.pending
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or self.exhausted or self.pending:
+            return
+        self.fetch(self.page_size)
+
+    def fetch(self, limit):
+        if self.asynchronous:
+            self.pending = True
+            generation = self.generation
+            self.fetch_page(after_id=self.last_id, limit=limit,
+                            callback=lambda rows: self.append_rows(rows, generation, limit),
+                            error_callback=lambda message: self.fetch_failed(message, generation))
+        else:
+            self.append_rows(self.fetch_page(after_id=self.last_id, limit=limit), limit=limit)
+
+    def append_rows(self, rows, generation=None, limit=None):
+        if generation is not None:
+            if generation != self.generation:
+                return  # a refresh happened while this page was loading
+            self.pending = False
+        if len(rows) < (limit or self.page_size):
+            self.exhausted = True
+        if rows:
+            first = len(self.rows)
+            self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+            self.rows.extend(rows)
+            self.last_id = rows[-1][0]
+            self.endInsertRows()
+        self.continue_seek()
+
+    def fetch_failed(self, message, generation):
+        # Clear pending so scrolling asks for the page again
+        print(f"Loading page failed: {message}")
+        if generation == self.generation:
+            self.pending = False
+            self.seek_target = None
+
+    def seek(self, record_id, callback):
+        # Loads pages up to the row with this id (rows are in id order), then calls
+        # callback(row number), or callback(None) if there is no such row
+        self.seek_target = (record_id, callback)
+        self.continue_seek()
+
+    def continue_seek(self):
+        if self.seek_target is None or self.pending:
+            return
+        record_id, callback = self.seek_target
+        row = bisect_left(self.rows, record_id, key=lambda loaded: loaded[0])
+        if row < len(self.rows) or self.exhausted:
+            self.seek_target = None
+            callback(row if row < len(self.rows) and self.rows[row][0] == record_id else None)
+        else:
+            self.fetch(self.SEEK_PAGE_SIZE)
+
+    def refresh(self):
+        self.beginResetModel()
+        self.generation += 1
+        self.rows = []
+        self.last_id = 0
+        self.exhausted = False
+        self.pending = False
+        self.endResetModel()
+        self.fetchMore()
+
+    def set_fetch_page(self, fetch_page):
+        self.fetch_page = fetch_page
+        self.refresh()
+
+    def row(self, row):
+        return self.rows[row]
+
+def create_table_view(model, stretch=False):
+    view = QTableView()
+    view.setModel(model)
+    view.setSelectionBehavior(QAbstractItemView.SelectRows)
+    if stretch:
+        view.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+    return view
+
+class ActionDelegate(QStyledItemDelegate):
+    # Paints the row's action buttons and hit-tests clicks, so an action column
+    # costs no widgets per row. Each action is (label, callback) or
+    # (label, callback, visible) where visible(row) hides the button for that row.
+    MARGIN = 4
+    PADDING = 24
+
+    def __init__(self, actions, parent=None):
+        super().__init__(parent)
+        self.actions = actions
+
+    def row_actions(self, index):
+        row = index.model().row(index.row())
+        return [action for action in self.actions if len(action) < 3 or action[2](row)]
+
+    def button_rects(self, option, actions):
+        rects = []
+        x = option.rect.x() + self.MARGIN
+        height = option.rect.height() - 2 * self.MARGIN
+        for action in actions:
+            width = option.fontMetrics.horizontalAdvance(action[0]) + self.PADDING
+            rects.append(QRect(x, option.rect.y() + self.MARGIN, width, height))
+            x += width + self.MARGIN
+        return rects
+
+    def paint(self, painter, option, index):
+        widget = option.widget
+        style = widget.style() if widget else QApplication.style()
+        actions = self.row_actions(index)
+        for action, rect in zip(actions, self.button_rects(option, actions)):
+            button = QStyleOptionButton()
+            button.rect = rect
+            button.text = action[0]
+            button.state = QStyle.State_Enabled | QStyle.State_Raised
+            style.drawControl(QStyle.CE_PushButton, button, painter, widget)
+
+    def sizeHint(self, option, index):
+        actions = self.row_actions(index)
+        width = sum(option.fontMetrics.horizontalAdvance(action[0]) + self.PADDING + self.MARGIN for action in actions)
+        return QSize(width + self.MARGIN, option.fontMetrics.height() + 2 * self.MARGIN + 12)
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() == QEvent.MouseButtonRelease and event.button() == Qt.LeftButton:
+            actions = self.row_actions(index)
+            for action, rect in zip(actions, self.button_rects(option, actions)):
+                if rect.contains(event.pos()):
+                    row = model.row(index.row())
+                    # Run after the event returns: the callback may reset the model.
+                    QTimer.singleShot(0, lambda callback=action[1]: callback(row))
+                    return True
+        return super().editorEvent(event, model, option, index)
+
+def set_action_column(view, column, actions):
+    delegate = ActionDelegate(actions, view)
+    view.setItemDelegateForColumn(column, delegate)
+    view.horizontalHeader().setSectionResizeMode(column, QHeaderView.ResizeToContents)
+    return delegate
@@ -0,0 +1,174 @@
+import argparse
+import sqlite3
+import sys
+import threading
+import time
+from datetime import datetime
+
+from database import Database
+
+class TelemetryIngest:
+    # Buffers readings in memory and writes them from a background thread with its own
+    # connection, at most batch_size readings per transaction. A flush happens when
+    # batch_size readings are waiting or flush_interval seconds have passed, so producers
+    # never wait on SQLite. A flush that cannot get the database (SQLITE_BUSY or
+    # SQLITE_LOCKED) is put back at the front of the buffer and retried with backoff; any
+    # other error drops the batch. Once closed, the writer gets CLOSE_RETRIES more attempts
+    # and then drops whatever is left, so close() always returns.
+    MAX_RETRY_DELAY = 5.0
+    CLOSE_RETRIES = 2
+    TRANSIENT_ERRORS = (sqlite3.SQLITE_BUSY, sqlite3.SQLITE_LOCKED)
+
+    def __init__(self, db_name='dashboard.db', batch_size=20000, flush_interval=0.5, max_buffered=1000000,
+                 db_options=None):
+        self.db_name = db_name
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_buffered = max_buffered
+        self.db_options = db_options or {}
+        self.buffer = []
+        self.condition = threading.Condition()
+        self.closed = False
+        self.flushed = 0
+        self.flushes = 0
+        self.retries = 0
+        self.dropped = 0
+        self.flush_seconds = 0.0
+        self.error = None
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def add(self, machine_id, ts, value):
+        self.add_many([(machine_id, ts, value)])
+
+    def add_many(self, readings):
+        with self.condition:
+            if self.closed:
+                raise ValueError("Telemetry ingest is closed")
+            # Back-pressure: only block producers when the writer falls far behind
+            while len(self.buffer) >= self.max_buffered:
+                self.condition.wait()
+            self.buffer.extend(readings)
+            if len(self.buffer) >= self.batch_size:
+                self.condition.notify_all()
+
+    def run(self):
+        db = Database(self.db_name, **self.db_options)
+        retry_delay = 0
+        close_retries = 0
+        try:
+            while True:
+                with self.condition:
+                    if retry_delay:
+                        self.condition.wait(retry_delay)
+                    elif not self.closed and len(self.buffer) < self.batch_size:
+                        self.condition.wait(self.flush_interval)
+                    batch = self.buffer[:self.batch_size]
+                    del self.buffer[:self.batch_size]
+                    closed = self.closed
+                    self.condition.notify_all()
+                if not batch:
+                    if closed:
+                        break
+                    continue
+                started = time.perf_counter()
+                try:
+                    db.insert_telemetry(batch)
+                except sqlite3.Error as e:
+                    self.error = e
+                    # Extended result codes keep the primary code in the low byte
+                    transient = (getattr(e, 'sqlite_errorcode', None) or 0) & 0xff in self.TRANSIENT_ERRORS
+                    if transient and not (closed and close_retries >= self.CLOSE_RETRIES):
+                        # Requeue the batch ahead of newer readings
+                        self.retries += 1
+                        close_retries += closed
+                        retry_delay = min(max(retry_delay * 2, 0.05), self.MAX_RETRY_DELAY)
+                        with self.condition:
+                            self.buffer[:0] = batch
+                        continue
+                    # Retrying cannot help (a bad batch, a full or read-only disk, schema errors)
+                    if transient:
+                        # Closing and still locked out: give up on the rest of the buffer too
+                        with self.condition:
+                            batch += self.buffer
+                            self.buffer.clear()
+                    self.dropped += len(batch)
+                    print(f"Telemetry flush dropped {len(batch)} readings: {e}")
+                    continue
+                retry_delay = 0
+                close_retries = 0
+                self.flush_seconds += time.perf_counter() - started
+                self.flushed += len(batch)
+                self.flushes += 1
+        finally:
+            db.close()
+
+    def close(self):
+        # Flushes everything still buffered, then stops the writer thread
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+        self.thread.join()
+
+def parse_timestamp(text):
+    # Unix time in milliseconds, or an ISO 8601 date and time
+    text = text.strip()
+    if not text:
+        return int(time.time() * 1000)
+    try:
+        return int(text)
+    except ValueError:
+        return int(datetime.fromisoformat(text).timestamp() * 1000)
+
+def read_readings(f):
+    # Lines of "machine_id,value" (timestamped now) or "machine_id,ts,value"
+    for line_number, line in enumerate(f, 1):
+        fields = line.strip().split(',')
+        if not fields[0] or fields[0].startswith('#') or fields[0] == 'machine_id':
+            continue
+        try:
+            if len(fields) == 2:
+                yield int(fields[0]), int(time.time() * 1000), float(fields[1])
+            elif len(fields) == 3:
+                yield int(fields[0]), parse_timestamp(fields[1]), float(fields[2])
+            else:
+                raise ValueError("expected machine_id,value or machine_id,ts,value")
+        except ValueError as e:
+            raise ValueError(f"Line {line_number}: {e}") from e
+
+def main():
+    parser = argparse.ArgumentParser(description="Feed machine telemetry readings into the maintenance database")
+    parser.add_argument('path', help="file of machine_id,[ts,]value lines, or - for stdin")
+    parser.add_argument('--db', default='dashboard.db')
+    parser.add_argument('--batch-size', type=int, default=20000)
+    parser.add_argument('--flush-interval', type=float, default=0.5)
+    args = parser.parse_args()
+
+    ingest = TelemetryIngest(args.db, args.batch_size, args.flush_interval)
+    f = sys.stdin if args.path == '-' else open(args.path)
+    started = time.perf_counter()
+    count = 0
+    try:
+        batch = []
+        for reading in read_readings(f):
+            batch.append(reading)
+            if len(batch) >= 1000:
+                ingest.add_many(batch)
+                count += len(batch)
+                batch = []
+        ingest.add_many(batch)
+        count += len(batch)
+    except ValueError as e:
+        sys.exit(str(e))
+    finally:
+        if f is not sys.stdin:
+            f.close()
+        ingest.close()
+    elapsed = time.perf_counter() - started
+    print(f"Ingested {count} readings in {elapsed:.1f} s ({count / max(elapsed, 1e-9):.0f} readings/s, "
+          f"{ingest.flushes} flushes, {ingest.retries} retries)")
+    if ingest.dropped:
+        print(f"Dropped {ingest.dropped} readings that could not be stored: {ingest.error}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+import os
+import sys
+from datetime import date, timedelta
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import Database
+from predictive_maintenance import FailureModel
+from status_sweep import StatusSweep
+
+def days_ago(days):
+    return (date.today() - timedelta(days=days)).isoformat()
+
+@pytest.fixture
+def db():
+    db = Database(':memory:')
+    yield db
+    db.close()
+
+def add_machine(db, machine_type, frequency, last_maintenance):
+    db.add_machine(f"{machine_type} {last_maintenance}", machine_type, "Plant", days_ago(400), frequency)
+    machine_id = db.cursor.execute("SELECT MAX(id) FROM machines").fetchone()[0]
+    db.cursor.execute("UPDATE machines SET last_maintenance_date = ? WHERE id = ?", (last_maintenance, machine_id))
+    db.conn.commit()
+    return machine_id
+
+def seed_history(db, machine_type, intervals):
+    # One machine whose maintenance history has the given gaps in days, oldest first
+    machine_id = add_machine(db, machine_type, 30, None)
+    day = 400
+    for interval in intervals:
+        day -= interval
+        db.cursor.execute("INSERT INTO maintenance_history (machine_id, maintenance_date, description) VALUES (?, ?, ?)",
+                          (machine_id, days_ago(day), "service"))
+    db.conn.commit()
+
+def sweep_status(db, machine_id):
+    StatusSweep(db, model=FailureModel(db)).run()
+    return db.get_machine(machine_id)[7]
+
+@pytest.mark.parametrize('frequency', [7, 30, 120])
+def test_unfitted_machine_maintained_today_is_healthy(db, frequency):
+    machine_id = add_machine(db, "Lathe", frequency, None)
+    db.add_maintenance(machine_id, "service")
+
+    assert sweep_status(db, machine_id) == "Healthy"
+
+def test_fitted_machine_maintained_today_is_healthy(db):
+    seed_history(db, "Press", [28, 30, 32, 29, 31, 30])
+    machine_id = add_machine(db, "Press", 365, days_ago(0))
+
+    assert sweep_status(db, machine_id) == "Healthy"
+
+@pytest.mark.parametrize('age, status', [(5, "Healthy"), (26, "Warning"), (40, "Critical")])
+def test_fitted_machine_follows_its_fitted_interval(db, age, status):
+    # The configured 365 days is ignored once the type's history shows a ~30 day interval
+    seed_history(db, "Press", [28, 30, 32, 29, 31, 30])
+    machine_id = add_machine(db, "Press", 365, days_ago(age))
+
+    assert sweep_status(db, machine_id) == status
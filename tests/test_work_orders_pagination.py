@@ -0,0 +1,50 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import Database
+
+WORK_ORDERS = 20000
+
+@pytest.fixture
+def db():
+    db = Database(':memory:')
+    db.add_user('tech', 'secret', 'technician')
+    technician = db.cursor.execute("SELECT id FROM users WHERE username = 'tech'").fetchone()[0]
+    # Every third work order is unassigned so the LEFT JOIN is exercised
+    db.executemany_chunked('''
+    INSERT INTO work_orders (title, description, status, priority, assigned_to, due_date)
+    VALUES (?, ?, ?, ?, ?, ?)
+    ''', ((f"Work order {i}", "", 'Open', 'Low', None if i % 3 == 0 else technician, '2026-01-01')
+          for i in range(WORK_ORDERS)))
+    yield db
+    db.close()
+
+def page_through(fetch, page_size):
+    pages, after_id = [], 0
+    while True:
+        page = fetch(after_id=after_id, limit=page_size)
+        if not page:
+            return pages
+        pages.append(page)
+        after_id = page[-1][0]
+
+@pytest.mark.parametrize('method', ['get_work_orders', 'get_work_orders_with_assignees'])
+@pytest.mark.parametrize('page_size', [1000, 999])
+def test_keyset_pages_are_complete_and_disjoint(db, method, page_size):
+    pages = page_through(getattr(db, method), page_size)
+    ids = [row[0] for page in pages for row in page]
+
+    assert all(len(page) == page_size for page in pages[:-1])
+    assert len(ids) == len(set(ids)) == WORK_ORDERS
+    assert ids == sorted(ids)
+    assert ids == [row[0] for row in db.get_work_orders()]
+
+def test_assignee_join_matches_assignments(db):
+    rows = [row for page in page_through(db.get_work_orders_with_assignees, 1000) for row in page]
+
+    assert all(row[-1] == 'tech' for row in rows if row[5] is not None)
+    assert sum(row[-1] is None for row in rows) == len(range(0, WORK_ORDERS, 3))
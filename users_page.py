@@ -1,4 +1,6 @@
-from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QTableWidget, QTableWidgetItem, QPushButton, QHeaderView, QDialog, QFormLayout, QLineEdit, QComboBox
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QPushButton, QDialog, QFormLayout, QLineEdit, QComboBox
+
+from table_model import LazyTableModel, create_table_view, set_action_column
 
 class UsersPage(QWidget):
     def __init__(self, main_window):
@@ -6,10 +8,13 @@ class UsersPage(QWidget):
         self.main_window = main_window
         layout = QVBoxLayout(self)
         
-        self.table = QTableWidget()
-        self.table.setColumnCount(4)
-        self.table.setHorizontalHeaderLabels(["Username", "Role", "Validated", "Actions"])
-        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.model = LazyTableModel(
+            ["Username", "Role", "Validated", "Actions"],
+            [1, 2, lambda u: "Yes" if u[3] else "No"],
+            self.main_window.async_db.get_users, asynchronous=True)
+        self.table = create_table_view(self.model, stretch=True)
+        set_action_column(self.table, 3, [("Validate", self.validate_user, lambda u: not u[3]),
+                                          ("Delete", self.delete_user)])
         
         add_user_button = QPushButton("Add User")
         add_user_button.clicked.connect(self.show_add_user_form)
@@ -20,27 +25,7 @@ class UsersPage(QWidget):
         self.update_table()
 
     def update_table(self):
-        self.table.setRowCount(0)
-        users = self.main_window.db.get_users()
-        
-        for user in users:
-            row_position = self.table.rowCount()
-            self.table.insertRow(row_position)
-            
-            self.table.setItem(row_position, 0, QTableWidgetItem(user[1]))
-            self.table.setItem(row_position, 1, QTableWidgetItem(user[2]))
-            self.table.setItem(row_position, 2, QTableWidgetItem("Yes" if user[3] else "No"))
-            
-            actions_widget = QWidget()
-            actions_layout = QHBoxLayout(actions_widget)
-            if not user[3]:
-                validate_button = QPushButton("Validate")
-                validate_button.clicked.connect(lambda _, u=user: self.validate_user(u))
-                actions_layout.addWidget(validate_button)
-            delete_button = QPushButton("Delete")
-            delete_button.clicked.connect(lambda _, u=user: self.delete_user(u))
-            actions_layout.addWidget(delete_button)
-            self.table.setCellWidget(row_position, 3, actions_widget)
+        self.model.refresh()
 
     def show_add_user_form(self):
         form = AddUserForm(self.main_window)
@@ -57,8 +42,7 @@ class UsersPage(QWidget):
             f"Are you sure you want to delete user {user[1]}?"
         )
         if reply:
-            self.main_window.db.cursor.execute("DELETE FROM users WHERE id = ?", (user[0],))
-            self.main_window.db.conn.commit()
+            self.main_window.db.delete_user(user[0])
             self.update_table()
 
 class AddUserForm(QDialog):
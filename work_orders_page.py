@@ -1,4 +1,7 @@
-from PyQt5.QtWidgets import QWidget, QVBoxLayout, QTableWidget, QTableWidgetItem, QPushButton, QDialog, QFormLayout, QLineEdit, QComboBox, QDateEdit, QTextEdit
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QPushButton, QDialog, QFormLayout, QLineEdit, QComboBox, QDateEdit, QTextEdit
+from PyQt5.QtCore import QDate
+
+from table_model import LazyTableModel, create_table_view, set_action_column
 
 class WorkOrdersPage(QWidget):
     def __init__(self, main_window):
@@ -6,9 +9,12 @@ class WorkOrdersPage(QWidget):
         self.main_window = main_window
         layout = QVBoxLayout(self)
 
-        self.table = QTableWidget()
-        self.table.setColumnCount(7)
-        self.table.setHorizontalHeaderLabels(["Title", "Description", "Status", "Priority", "Assigned To", "Due Date", "Actions"])
+        self.model = LazyTableModel(
+            ["Title", "Description", "Status", "Priority", "Assigned To", "Due Date", "Actions"],
+            [1, 2, 3, 4, lambda wo: wo[7] or "Unassigned", 6],
+            self.main_window.async_db.get_work_orders_with_assignees, asynchronous=True)
+        self.table = create_table_view(self.model)
+        set_action_column(self.table, 6, [("Edit", self.edit_work_order)])
 
         add_work_order_button = QPushButton("Add Work Order")
         add_work_order_button.clicked.connect(self.show_add_work_order_dialog)
@@ -19,23 +25,7 @@ class WorkOrdersPage(QWidget):
         self.update_table()
 
     def update_table(self):
-        self.table.setRowCount(0)
-        work_orders = self.main_window.db.get_work_orders()
-        for work_order in work_orders:
-            row_position = self.table.rowCount()
-            self.table.insertRow(row_position)
-            
-            self.table.setItem(row_position, 0, QTableWidgetItem(work_order[1]))
-            self.table.setItem(row_position, 1, QTableWidgetItem(work_order[2]))
-            self.table.setItem(row_position, 2, QTableWidgetItem(work_order[3]))
-            self.table.setItem(row_position, 3, QTableWidgetItem(work_order[4]))
-            assigned_to = self.main_window.db.get_users(work_order[5])[0] if work_order[5] else "Unassigned"
-            self.table.setItem(row_position, 4, QTableWidgetItem(assigned_to[1] if isinstance(assigned_to, tuple) else assigned_to))
-            self.table.setItem(row_position, 5, QTableWidgetItem(work_order[6]))
-
-            edit_button = QPushButton("Edit")
-            edit_button.clicked.connect(lambda _, wo=work_order: self.edit_work_order(wo))
-            self.table.setCellWidget(row_position, 6, edit_button)
+        self.model.refresh()
 
     def show_add_work_order_dialog(self):
         dialog = AddWorkOrderDialog(self.main_window)
@@ -61,10 +51,8 @@ class AddWorkOrderDialog(QDialog):
         self.priority_input = QComboBox()
         self.priority_input.addItems(["Low", "Medium", "High", "Critical"])
         self.assigned_to_input = QComboBox()
-        users = self.main_window.db.get_users()
         self.assigned_to_input.addItem("Unassigned", None)
-        for user in users:
-            self.assigned_to_input.addItem(user[1], user[0])
+        self.main_window.async_db.get_users(callback=self.set_users)
         self.due_date_input = QDateEdit()
 
         submit_button = QPushButton("Add Work Order")
@@ -78,6 +66,10 @@ class AddWorkOrderDialog(QDialog):
         layout.addRow("Due Date:", self.due_date_input)
         layout.addRow(submit_button)
 
+    def set_users(self, users):
+        for user in users:
+            self.assigned_to_input.addItem(user[1], user[0])
+
     def add_work_order(self):
         title = self.title_input.text()
         description = self.description_input.toPlainText()
@@ -106,11 +98,8 @@ class EditWorkOrderDialog(QDialog):
         self.priority_input.addItems(["Low", "Medium", "High", "Critical"])
         self.priority_input.setCurrentText(work_order[4])
         self.assigned_to_input = QComboBox()
-        users = self.main_window.db.get_users()
         self.assigned_to_input.addItem("Unassigned", None)
-        for user in users:
-            self.assigned_to_input.addItem(user[1], user[0])
-        self.assigned_to_input.setCurrentIndex(self.assigned_to_input.findData(work_order[5]))
+        self.main_window.async_db.get_users(callback=self.set_users)
         self.due_date_input = QDateEdit()
         self.due_date_input.setDate(QDate.fromString(work_order[6], "yyyy-MM-dd"))
 
@@ -125,6 +114,11 @@ class EditWorkOrderDialog(QDialog):
         layout.addRow("Due Date:", self.due_date_input)
         layout.addRow(submit_button)
 
+    def set_users(self, users):
+        for user in users:
+            self.assigned_to_input.addItem(user[1], user[0])
+        self.assigned_to_input.setCurrentIndex(self.assigned_to_input.findData(self.work_order[5]))
+
     def update_work_order(self):
         title = self.title_input.text()
         description = self.description_input.toPlainText()
@@ -133,10 +127,5 @@ class EditWorkOrderDialog(QDialog):
         assigned_to = self.assigned_to_input.currentData()
         due_date = self.due_date_input.date().toString("yyyy-MM-dd")
 
-        self.main_window.db.cursor.execute('''
-        UPDATE work_orders 
-        SET title = ?, description = ?, status = ?, priority = ?, assigned_to = ?, due_date = ?
-        WHERE id = ?
-        ''', (title, description, status, priority, assigned_to, due_date, self.work_order[0]))
-        self.main_window.db.conn.commit()
-        self.accept()
\ No newline at end of file
+        self.main_window.submit_write(self, 'update_work_order', self.work_order[0], title, description, status,
+                                      priority, assigned_to, due_date)
\ No newline at end of file